@@ -3,7 +3,16 @@
 from importlib.metadata import version
 
 from wet_mcp.__main__ import _cli as main
-from wet_mcp.server import mcp
 
 __version__ = version("wet-mcp")
 __all__ = ["mcp", "main", "__version__"]
+
+
+def __getattr__(name: str):
+    # The server (FastMCP, pydantic, crawler glue) is imported on first use,
+    # so the warmup and setup-sync subcommands start without it.
+    if name == "mcp":
+        from wet_mcp.server import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
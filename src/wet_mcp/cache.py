@@ -4,13 +4,18 @@ Uses SQLite for persistence across restarts. Cache entries expire based
 on configurable TTL per action type. Thread-safe via WAL mode.
 
 Cache is transparent — callers use ``get``/``set`` and the cache handles
-expiry automatically. Old entries are purged periodically.
+expiry automatically. Old entries are purged periodically. Async callers
+use ``aget``/``aset``: in-memory hits are served inline and SQLite work
+runs in a worker thread so the event loop is never blocked on disk.
 """
 
+import asyncio
 import hashlib
 import json
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 
 from loguru import logger
@@ -19,20 +24,31 @@ from loguru import logger
 _DEFAULT_TTLS: dict[str, int] = {
     "search": 3600,  # 1 hour
     "research": 3600,  # 1 hour
+    "docs": 3600,  # 1 hour (also cleared when a library is re-indexed)
     "extract": 86400,  # 1 day
     "crawl": 86400,  # 1 day
     "map": 86400,  # 1 day
+    "backend_probe": 21600,  # 6 hours (embedding/rerank availability)
 }
 
 # Purge expired entries every N operations
 _PURGE_INTERVAL = 50
 
+# In-process LRU in front of SQLite: repeated lookups (agent loops re-issuing
+# the same search) are served from memory without a query + row decode.
+# Bounded by entry count and by total content size (in characters); entries
+# above the per-entry limit (large crawls) are only ever served from SQLite.
+_MEM_CACHE_SIZE = 512
+_MEM_CACHE_MAX_CHARS = 32 << 20  # ~32M characters
+_MEM_ENTRY_MAX_CHARS = 1 << 20  # ~1M characters
+
 
 def _cache_key(action: str, params: dict) -> str:
     """Generate a deterministic cache key from action + params."""
-    # Sort keys for deterministic hashing
+    # Sort keys for deterministic hashing. A 128-bit blake2b digest is ample
+    # for a cache key and cheaper than sha256 on large URL lists.
     raw = json.dumps({"action": action, **params}, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(raw.encode()).hexdigest()
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
 
 class WebCache:
@@ -42,9 +58,19 @@ class WebCache:
         self._db_path = db_path
         self._ttls = {**_DEFAULT_TTLS, **(ttls or {})}
         self._op_count = 0
+        # key -> (expires_at, action, content)
+        self._mem: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._mem_chars = 0
+        self._mem_hits: dict[str, int] = {}
+        # key -> SQLite-served hits not yet written to hit_count; flushed in
+        # the next write transaction so reads never take a write lock.
+        self._pending_hits: dict[str, int] = {}
 
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(db_path))
+        # One connection shared with worker threads (aget/aset); the lock
+        # serializes every statement on it.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode = WAL")
         self._conn.execute("PRAGMA synchronous = NORMAL")
@@ -79,45 +105,137 @@ class WebCache:
         """Get cached result if exists and not expired."""
         key = _cache_key(action, params)
         now = time.time()
+        content = self._mem_get(key, action, now)
+        if content is not None:
+            return content
+        return self._db_hit(key, action, self._db_get(key, now))
 
-        row = self._conn.execute(
-            "SELECT content FROM web_cache WHERE key = ? AND expires_at > ?",
-            (key, now),
-        ).fetchone()
-
-        if row:
-            self._conn.execute(
-                "UPDATE web_cache SET hit_count = hit_count + 1 WHERE key = ?",
-                (key,),
-            )
-            self._conn.commit()
-            logger.debug(f"Cache HIT: {action} ({key[:12]}...)")
-            return row["content"]
+    async def aget(self, action: str, params: dict) -> str | None:
+        """``get`` for async callers; only a memory miss leaves the loop."""
+        key = _cache_key(action, params)
+        now = time.time()
+        content = self._mem_get(key, action, now)
+        if content is not None:
+            return content
+        row = await asyncio.to_thread(self._db_get, key, now)
+        return self._db_hit(key, action, row)
 
-        logger.debug(f"Cache MISS: {action} ({key[:12]}...)")
+    def _mem_get(self, key: str, action: str, now: float) -> str | None:
+        """Look ``key`` up in the in-process LRU, dropping it if expired."""
+        entry = self._mem.get(key)
+        if entry is None:
+            return None
+        if entry[0] > now:
+            self._mem.move_to_end(key)
+            self._mem_hits[action] = self._mem_hits.get(action, 0) + 1
+            logger.debug("Cache HIT (mem): {} ({}...)", action, key[:12])
+            return entry[2]
+        self._mem_discard(key)
         return None
 
+    def _db_get(self, key: str, now: float) -> tuple[float, str] | None:
+        """Read an unexpired row. Safe off the loop thread."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, expires_at FROM web_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return (row["expires_at"], row["content"]) if row else None
+
+    def _db_hit(
+        self, key: str, action: str, row: tuple[float, str] | None
+    ) -> str | None:
+        """Promote a SQLite hit into the LRU; log the miss otherwise."""
+        if row is None:
+            logger.debug("Cache MISS: {} ({}...)", action, key[:12])
+            return None
+        expires_at, content = row
+        self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+        self._remember(key, expires_at, action, content)
+        logger.debug("Cache HIT: {} ({}...)", action, key[:12])
+        return content
+
     def set(self, action: str, params: dict, content: str) -> None:
         """Store result in cache with TTL."""
         key = _cache_key(action, params)
+        expires_at = self._remember_new(key, action, content)
+        self._db_set(key, action, params, content, expires_at)
+
+    async def aset(self, action: str, params: dict, content: str) -> None:
+        """``set`` for async callers; the SQLite write runs in a thread."""
+        key = _cache_key(action, params)
+        expires_at = self._remember_new(key, action, content)
+        await asyncio.to_thread(self._db_set, key, action, params, content, expires_at)
+
+    def _remember_new(self, key: str, action: str, content: str) -> float:
+        """Insert a fresh entry into the LRU and return its expiry time."""
+        expires_at = time.time() + self._ttls.get(action, 3600)
+        self._remember(key, expires_at, action, content)
+        return expires_at
+
+    def _db_set(
+        self, key: str, action: str, params: dict, content: str, expires_at: float
+    ) -> None:
+        """Persist an entry. Safe off the loop thread."""
         now = time.time()
-        ttl = self._ttls.get(action, 3600)
-        expires_at = now + ttl
-
-        self._conn.execute(
-            """INSERT OR REPLACE INTO web_cache
-               (key, action, params, content, created_at, expires_at, hit_count)
-               VALUES (?, ?, ?, ?, ?, ?, 0)""",
-            (key, action, json.dumps(params, sort_keys=True), content, now, expires_at),
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO web_cache
+                   (key, action, params, content, created_at, expires_at, hit_count)
+                   VALUES (?, ?, ?, ?, ?, ?, 0)""",
+                (
+                    key,
+                    action,
+                    json.dumps(params, sort_keys=True),
+                    content,
+                    now,
+                    expires_at,
+                ),
+            )
+            self._flush_hits()
+            self._conn.commit()
+            logger.debug(
+                "Cache SET: {} ({}...) TTL={}s",
+                action,
+                key[:12],
+                self._ttls.get(action, 3600),
+            )
+
+            # Periodic purge
+            self._op_count += 1
+            if self._op_count >= _PURGE_INTERVAL:
+                self._purge_expired()
+                self._op_count = 0
+
+    def _flush_hits(self) -> None:
+        """Add pending SQLite hits to ``hit_count``. Caller holds the lock."""
+        if not self._pending_hits:
+            return
+        # Swap first: hits recorded on the loop meanwhile go to the new dict
+        pending, self._pending_hits = self._pending_hits, {}
+        self._conn.executemany(
+            "UPDATE web_cache SET hit_count = hit_count + ? WHERE key = ?",
+            [(count, key) for key, count in pending.items()],
         )
-        self._conn.commit()
-        logger.debug(f"Cache SET: {action} ({key[:12]}...) TTL={ttl}s")
 
-        # Periodic purge
-        self._op_count += 1
-        if self._op_count >= _PURGE_INTERVAL:
-            self._purge_expired()
-            self._op_count = 0
+    def _remember(self, key: str, expires_at: float, action: str, content: str) -> None:
+        """Insert into the in-process LRU, evicting the least recently used."""
+        self._mem_discard(key)
+        if len(content) > _MEM_ENTRY_MAX_CHARS:
+            return
+        self._mem[key] = (expires_at, action, content)
+        self._mem_chars += len(content)
+        while (
+            len(self._mem) > _MEM_CACHE_SIZE or self._mem_chars > _MEM_CACHE_MAX_CHARS
+        ):
+            _key, (_expires, _action, evicted) = self._mem.popitem(last=False)
+            self._mem_chars -= len(evicted)
+
+    def _mem_discard(self, key: str) -> None:
+        """Drop ``key`` from the in-process LRU if present."""
+        entry = self._mem.pop(key, None)
+        if entry is not None:
+            self._mem_chars -= len(entry[2])
 
     def get_extract(self, url: str) -> str | None:
         """Get cached extract result for a single URL.
@@ -127,13 +245,14 @@ class WebCache:
         """
         # Check extract cache with url in params
         for action in ("extract", "crawl"):
-            row = self._conn.execute(
-                """SELECT content FROM web_cache
-                   WHERE action = ? AND expires_at > ?
-                   AND params LIKE ?
-                   LIMIT 1""",
-                (action, time.time(), f'%"{url}"%'),
-            ).fetchone()
+            with self._lock:
+                row = self._conn.execute(
+                    """SELECT content FROM web_cache
+                       WHERE action = ? AND expires_at > ?
+                       AND params LIKE ?
+                       LIMIT 1""",
+                    (action, time.time(), f'%"{url}"%'),
+                ).fetchone()
             if row:
                 logger.debug(f"Extract cache HIT for URL: {url[:60]}...")
                 return row["content"]
@@ -151,35 +270,44 @@ class WebCache:
 
     def clear(self, action: str | None = None) -> int:
         """Clear cache entries. If action specified, only clear that action."""
-        if action:
-            cursor = self._conn.execute(
-                "DELETE FROM web_cache WHERE action = ?", (action,)
-            )
-        else:
-            cursor = self._conn.execute("DELETE FROM web_cache")
-        self._conn.commit()
+        with self._lock:
+            if action:
+                cursor = self._conn.execute(
+                    "DELETE FROM web_cache WHERE action = ?", (action,)
+                )
+                for key in [k for k, v in self._mem.items() if v[1] == action]:
+                    self._mem_discard(key)
+            else:
+                cursor = self._conn.execute("DELETE FROM web_cache")
+                self._mem.clear()
+                self._mem_chars = 0
+            self._conn.commit()
         return cursor.rowcount
 
     def stats(self) -> dict:
         """Get cache statistics."""
         now = time.time()
-        rows = self._conn.execute(
-            """
-            SELECT action,
-                   COUNT(*) as total,
-                   SUM(CASE WHEN expires_at > ? THEN 1 ELSE 0 END) as active,
-                   SUM(hit_count) as total_hits
-            FROM web_cache
-            GROUP BY action
-        """,
-            (now,),
-        ).fetchall()
+        with self._lock:
+            if self._pending_hits:
+                self._flush_hits()
+                self._conn.commit()
+            rows = self._conn.execute(
+                """
+                SELECT action,
+                       COUNT(*) as total,
+                       SUM(CASE WHEN expires_at > ? THEN 1 ELSE 0 END) as active,
+                       SUM(hit_count) as total_hits
+                FROM web_cache
+                GROUP BY action
+            """,
+                (now,),
+            ).fetchall()
 
         return {
             row["action"]: {
                 "total": row["total"],
                 "active": row["active"],
-                "hits": row["total_hits"],
+                "hits": row["total_hits"] + self._mem_hits.get(row["action"], 0),
             }
             for row in rows
         }
@@ -187,6 +315,10 @@ class WebCache:
     def close(self) -> None:
         """Close database connection."""
         try:
+            with self._lock:
+                if self._pending_hits:
+                    self._flush_hits()
+                    self._conn.commit()
             self._conn.close()
         except Exception:
             pass
@@ -71,6 +71,8 @@ class Settings(BaseSettings):
     - SYNC_REMOTE: Rclone remote name (e.g., "gdrive")
     - SYNC_FOLDER: Remote folder name (default: "wet-mcp")
     - SYNC_INTERVAL: Auto-sync interval in seconds (0 = manual only)
+    - WET_IPV4_ONLY: Resolve hosts via IPv4-only lookup in SSRF checks
+    - ONNX_THREADS: Threads per local ONNX session (default: 1, 0 = all cores)
     """
 
     # SearXNG
@@ -100,6 +102,9 @@ class Settings(BaseSettings):
     wet_cache: bool = True  # Enable/disable web cache
     cache_dir: str = ""  # Cache database directory, default: ~/.wet-mcp
 
+    # SSRF checks: resolve hostnames with a cheaper IPv4-only lookup
+    wet_ipv4_only: bool = False
+
     # Docs storage
     docs_db_path: str = ""  # Default: ~/.wet-mcp/docs.db
 
@@ -122,6 +127,10 @@ class Settings(BaseSettings):
     )
     rerank_top_n: int = 10  # Return top N after reranking
 
+    # Local ONNX models: threads per session. 1 avoids intra-op contention
+    # when concurrent requests already run in parallel; 0 = all cores.
+    onnx_threads: int = 1
+
     # Docs sync (rclone)
     sync_enabled: bool = False
     sync_remote: str = ""  # rclone remote name (e.g., "gdrive")
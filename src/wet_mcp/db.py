@@ -27,6 +27,27 @@ def _serialize_f32(vec: list[float]) -> bytes:
     return struct.pack(f"{len(vec)}f", *vec)
 
 
+# Vectors are stored int8-quantized for the KNN scan (4x fewer bytes per
+# distance computation) alongside the float32 original in an auxiliary
+# column, which sqlite-vec keeps out of the scan. The top candidates are
+# then rescored at full precision.
+_VEC_QUANTIZE = "vec_quantize_int8(?, 'unit')"
+_VEC_OVERSAMPLE = 4
+
+# Memory-map the docs DB so FTS and vector scans read pages without a
+# copy through the page cache.
+_MMAP_SIZE = 256 * 1024 * 1024
+
+# The embedding cache keeps a float32 copy of every vector it has seen, so
+# it is capped: past this many rows the oldest (by created_at) are evicted.
+_EMBEDDING_CACHE_MAX_ROWS = 20_000
+
+
+def _deserialize_f32(blob: bytes) -> list[float]:
+    """Inverse of ``_serialize_f32``."""
+    return list(struct.unpack(f"{len(blob) // 4}f", blob))
+
+
 def _now_ts() -> float:
     """Current timestamp as float."""
     return time.time()
@@ -136,6 +157,8 @@ class DocsDB:
         self._conn.execute("PRAGMA journal_mode = WAL")
         self._conn.execute("PRAGMA synchronous = NORMAL")
         self._conn.execute("PRAGMA busy_timeout = 5000")
+        self._conn.execute("PRAGMA temp_store = MEMORY")
+        self._conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
 
         # Try loading sqlite-vec extension
         if embedding_dims > 0:
@@ -262,22 +285,79 @@ class DocsDB:
             END
         """)
 
+        # Content-addressed embedding cache: re-indexing a library only
+        # embeds chunks whose text (or embedding model) changed.
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash BLOB PRIMARY KEY,
+                embedding BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embedding_cache_created
+            ON embedding_cache(created_at)
+        """)
+
         # Vector table (optional)
         if self._vec_enabled and self._embedding_dims > 0:
             row = self._conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='doc_chunks_vec'"
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name='doc_chunks_vec'"
             ).fetchone()
             if not row:
-                self._conn.execute(f"""
-                    CREATE VIRTUAL TABLE doc_chunks_vec
-                    USING vec0(
-                        id TEXT PRIMARY KEY,
-                        embedding float[{self._embedding_dims}]
-                    )
-                """)
+                self._create_vec_table()
+            elif "int8[" not in row["sql"] or "library_id" not in row["sql"]:
+                self._migrate_vec_table(row["sql"])
 
         self._conn.commit()
 
+    def _create_vec_table(self) -> None:
+        # library_id/version_id are metadata columns so KNN queries filter
+        # on them inside the MATCH instead of after the global top-k.
+        self._conn.execute(f"""
+            CREATE VIRTUAL TABLE doc_chunks_vec
+            USING vec0(
+                id TEXT PRIMARY KEY,
+                embedding int8[{self._embedding_dims}],
+                library_id TEXT,
+                version_id TEXT,
+                +embedding_f32 BLOB
+            )
+        """)
+
+    def _migrate_vec_table(self, old_sql: str) -> None:
+        """Rebuild an older vector table in the current layout.
+
+        Handles float32-only tables and int8 tables without the
+        library/version metadata columns. vec0 tables cannot be altered, so
+        rows are copied out, the table is recreated and the vectors
+        re-inserted with their chunk's library and version.
+        """
+        column = "embedding_f32" if "int8[" in old_sql else "embedding"
+        rows = self._conn.execute(f"""
+            SELECT v.id, v.{column} AS vec, c.library_id, c.version_id
+            FROM doc_chunks_vec v
+            LEFT JOIN doc_chunks c ON c.id = v.id
+        """).fetchall()
+        self._conn.execute("DROP TABLE doc_chunks_vec")
+        self._create_vec_table()
+        self._conn.executemany(
+            "INSERT INTO doc_chunks_vec "
+            "(id, embedding, library_id, version_id, embedding_f32) "
+            f"VALUES (?, {_VEC_QUANTIZE}, ?, ?, ?)",
+            [
+                (
+                    r["id"],
+                    r["vec"],
+                    r["library_id"] or "",
+                    r["version_id"] or "",
+                    r["vec"],
+                )
+                for r in rows
+            ],
+        )
+        logger.debug(f"Migrated {len(rows)} vectors to the current vector layout")
+
     # -----------------------------------------------------------------------
     # Stats
     # -----------------------------------------------------------------------
@@ -411,6 +491,9 @@ class DocsDB:
         self._conn.execute("DELETE FROM doc_chunks WHERE library_id = ?", (lib_id,))
         self._conn.execute("DELETE FROM versions WHERE library_id = ?", (lib_id,))
         self._conn.execute("DELETE FROM libraries WHERE id = ?", (lib_id,))
+        # Cached embeddings are content-addressed, not per library: drop
+        # them all rather than keep vectors for text that is gone.
+        self._conn.execute("DELETE FROM embedding_cache")
         self._conn.commit()
         return True
 
@@ -500,63 +583,62 @@ class DocsDB:
         Each chunk dict: {url, title, content, heading_path, chunk_index}
         """
         now = _now_ts()
-        count = 0
-
-        for i, chunk in enumerate(chunks):
-            chunk_id = uuid.uuid4().hex[:12]
-            self._conn.execute(
-                """INSERT INTO doc_chunks
-                   (id, version_id, library_id, url, title, chunk_index, content, heading_path, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    chunk_id,
-                    version_id,
-                    library_id,
-                    chunk.get("url", ""),
-                    chunk.get("title", ""),
-                    chunk.get("chunk_index", i),
-                    chunk["content"],
-                    chunk.get("heading_path", ""),
-                    now,
-                ),
+        rows = [
+            (
+                uuid.uuid4().hex[:12],
+                version_id,
+                library_id,
+                chunk.get("url", ""),
+                chunk.get("title", ""),
+                chunk.get("chunk_index", i),
+                chunk["content"],
+                chunk.get("heading_path", ""),
+                now,
             )
+            for i, chunk in enumerate(chunks)
+        ]
+        # One prepared statement for all rows; the FTS trigger fires inside
+        # the same transaction so chunks become searchable atomically.
+        self._conn.executemany(
+            """INSERT INTO doc_chunks
+               (id, version_id, library_id, url, title, chunk_index, content, heading_path, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
 
-            # Store embedding if available
-            if (
-                self._vec_enabled
-                and embeddings
-                and i < len(embeddings)
-                and embeddings[i]
-            ):
-                try:
-                    self._conn.execute(
-                        "INSERT INTO doc_chunks_vec (id, embedding) VALUES (?, ?)",
-                        (chunk_id, _serialize_f32(embeddings[i])),
-                    )
-                except Exception as e:
-                    logger.debug(f"Failed to store embedding: {e}")
-
-            count += 1
+        # Store embeddings if available
+        if self._vec_enabled and embeddings:
+            vec_rows = []
+            for row, emb in zip(rows, embeddings, strict=False):
+                if emb:
+                    vec = _serialize_f32(emb)
+                    vec_rows.append((row[0], vec, library_id, version_id, vec))
+            try:
+                self._conn.executemany(
+                    "INSERT INTO doc_chunks_vec "
+                    "(id, embedding, library_id, version_id, embedding_f32) "
+                    f"VALUES (?, {_VEC_QUANTIZE}, ?, ?, ?)",
+                    vec_rows,
+                )
+            except Exception as e:
+                logger.debug(f"Failed to store embeddings: {e}")
 
         self._conn.commit()
-        return count
+        return len(rows)
 
     def clear_version_chunks(self, version_id: str) -> int:
         """Remove all chunks for a version (before re-indexing)."""
         if self._vec_enabled:
-            chunk_ids = [
-                r["id"]
-                for r in self._conn.execute(
-                    "SELECT id FROM doc_chunks WHERE version_id = ?", (version_id,)
-                ).fetchall()
-            ]
-            for cid in chunk_ids:
-                try:
-                    self._conn.execute(
-                        "DELETE FROM doc_chunks_vec WHERE id = ?", (cid,)
-                    )
-                except Exception:
-                    pass
+            chunk_ids = self._conn.execute(
+                "SELECT id FROM doc_chunks WHERE version_id = ?", (version_id,)
+            ).fetchall()
+            try:
+                self._conn.executemany(
+                    "DELETE FROM doc_chunks_vec WHERE id = ?",
+                    [(r["id"],) for r in chunk_ids],
+                )
+            except Exception:
+                pass
 
         cursor = self._conn.execute(
             "DELETE FROM doc_chunks WHERE version_id = ?", (version_id,)
@@ -564,35 +646,68 @@ class DocsDB:
         self._conn.commit()
         return cursor.rowcount
 
+    # -----------------------------------------------------------------------
+    # Embedding cache
+    # -----------------------------------------------------------------------
+
+    def get_cached_embeddings(self, hashes: list[bytes]) -> dict[bytes, list[float]]:
+        """Look up cached embeddings by content hash; misses are omitted."""
+        found: dict[bytes, list[float]] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                "SELECT hash, embedding FROM embedding_cache "
+                f"WHERE hash IN ({placeholders})",
+                batch,
+            ).fetchall()
+            for row in rows:
+                found[row["hash"]] = _deserialize_f32(row["embedding"])
+        return found
+
+    def cache_embeddings(self, items: list[tuple[bytes, list[float]]]) -> None:
+        """Store embeddings keyed by content hash, evicting the oldest."""
+        now = _now_ts()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (hash, embedding, created_at) "
+            "VALUES (?, ?, ?)",
+            [(h, _serialize_f32(vec), now) for h, vec in items],
+        )
+        self._conn.execute(
+            "DELETE FROM embedding_cache WHERE hash IN ("
+            "SELECT hash FROM embedding_cache ORDER BY created_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (_EMBEDDING_CACHE_MAX_ROWS,),
+        )
+        self._conn.commit()
+
+    def clear_embedding_cache(self) -> int:
+        """Drop every cached embedding. Returns the number removed."""
+        cursor = self._conn.execute("DELETE FROM embedding_cache")
+        self._conn.commit()
+        return cursor.rowcount
+
     # -----------------------------------------------------------------------
     # Search
     # -----------------------------------------------------------------------
 
-    def search(
+    def search_fts(
         self,
         query: str,
         library_name: str | None = None,
         version: str | None = None,
         limit: int = 10,
-        query_embedding: list[float] | None = None,
-    ) -> list[dict]:
-        """Hybrid search: FTS5 + optional vector + quality scoring.
-
-        Uses tiered FTS5 queries (AND -> OR fallback), BM25 column weights
-        (boosting title/heading matches), min-max score normalization,
-        and RRF fusion when vector search is available.
-        Recency is intentionally excluded -- all doc chunks share the same
-        indexing timestamp, making recency meaningless for static docs.
+    ) -> dict | None:
+        """Run only the FTS5 stage of ``search``.
 
-        Args:
-            query: Search query text
-            library_name: Filter by library name
-            version: Filter by version
-            limit: Max results
-            query_embedding: Optional embedding vector for semantic search
+        Lets a caller overlap keyword retrieval with computing the query
+        embedding; pass the result to ``search`` as ``fts`` (with the same
+        ``limit``) to add vector hits and rank.
 
         Returns:
-            List of chunk dicts sorted by relevance score
+            Dict with ``library_id``, ``version_id``, normalized ``scores``
+            and ``chunks`` by chunk id, or None if the library is unknown.
         """
         # Resolve library/version filters
         library_id = None
@@ -600,7 +715,7 @@ class DocsDB:
         if library_name:
             lib = self.get_library(library_name)
             if not lib:
-                return []
+                return None
             library_id = lib["id"]
             if version:
                 ver = self.get_best_version(library_id, version)
@@ -666,30 +781,88 @@ class DocsDB:
             else:
                 fts_scores = dict.fromkeys(fts_scores, 1.0)
 
+        return {
+            "library_id": library_id,
+            "version_id": version_id,
+            "scores": fts_scores,
+            "chunks": fts_chunks,
+        }
+
+    def search(
+        self,
+        query: str,
+        library_name: str | None = None,
+        version: str | None = None,
+        limit: int = 10,
+        query_embedding: list[float] | None = None,
+        fts: dict | None = None,
+    ) -> list[dict]:
+        """Hybrid search: FTS5 + optional vector + quality scoring.
+
+        Uses tiered FTS5 queries (AND -> OR fallback), BM25 column weights
+        (boosting title/heading matches), min-max score normalization,
+        and RRF fusion when vector search is available.
+        Recency is intentionally excluded -- all doc chunks share the same
+        indexing timestamp, making recency meaningless for static docs.
+
+        Args:
+            query: Search query text
+            library_name: Filter by library name
+            version: Filter by version
+            limit: Max results
+            query_embedding: Optional embedding vector for semantic search
+            fts: Result of an earlier ``search_fts`` call for this query;
+                the FTS stage is run here when omitted
+
+        Returns:
+            List of chunk dicts sorted by relevance score
+        """
+        if fts is None:
+            fts = self.search_fts(query, library_name, version, limit)
+        if fts is None:
+            return []
+        library_id = fts["library_id"]
+        version_id = fts["version_id"]
+        fts_scores: dict[str, float] = fts["scores"]
+        fts_chunks: dict[str, dict] = fts["chunks"]
+        candidate_limit = limit * 3
+
         # --- Vector search ---
         vec_scores: dict[str, float] = {}
         if self._vec_enabled and query_embedding:
             try:
-                vec_sql = """
-                    SELECT v.id, v.distance
-                    FROM doc_chunks_vec v
-                    JOIN doc_chunks c ON v.id = c.id
-                    WHERE v.embedding MATCH ?
-                """
-                vec_params: list = [_serialize_f32(query_embedding)]
-
+                # int8 KNN prefilter (oversampled), then exact float32
+                # distances on the survivors. The library/version filter
+                # runs inside the KNN so other libraries cannot take the
+                # top-k slots.
+                query_vec = _serialize_f32(query_embedding)
+                knn_filter = ""
+                vec_params: list = [
+                    query_vec,
+                    query_vec,
+                    candidate_limit * _VEC_OVERSAMPLE,
+                ]
                 if library_id:
-                    vec_sql += " AND c.library_id = ?"
+                    knn_filter += " AND library_id = ?"
                     vec_params.append(library_id)
                 if version_id:
-                    vec_sql += " AND c.version_id = ?"
+                    knn_filter += " AND version_id = ?"
                     vec_params.append(version_id)
 
-                vec_sql += " ORDER BY v.distance LIMIT ?"
+                vec_sql = f"""
+                    SELECT v.id, vec_distance_cosine(v.embedding_f32, ?) AS distance
+                    FROM (
+                        SELECT id, embedding_f32 FROM doc_chunks_vec
+                        WHERE embedding MATCH {_VEC_QUANTIZE} AND k = ?{knn_filter}
+                    ) v
+                    JOIN doc_chunks c ON v.id = c.id
+                    ORDER BY distance LIMIT ?
+                """
                 vec_params.append(candidate_limit)
 
                 vec_rows = self._conn.execute(vec_sql, vec_params).fetchall()
                 for vr in vec_rows:
+                    # Cosine distance -> similarity
                     vec_scores[vr["id"]] = max(0.0, 1.0 - vr["distance"])
 
                     # Load chunk data if not already from FTS
@@ -709,12 +882,10 @@ class DocsDB:
         if vec_scores:
             # RRF fusion when both FTS and vector signals available
             k = 60
-            fts_ranked = sorted(
-                all_ids, key=lambda x: fts_scores.get(x, 0.0), reverse=True
-            )
-            vec_ranked = sorted(
-                all_ids, key=lambda x: vec_scores.get(x, 0.0), reverse=True
-            )
+            # Rank each signal over its own hits only; a chunk missing from
+            # one list takes the default rank below instead of a random slot.
+            fts_ranked = sorted(fts_scores, key=fts_scores.__getitem__, reverse=True)
+            vec_ranked = sorted(vec_scores, key=vec_scores.__getitem__, reverse=True)
             fts_rank = {cid: i + 1 for i, cid in enumerate(fts_ranked)}
             vec_rank = {cid: i + 1 for i, cid in enumerate(vec_ranked)}
 
@@ -841,6 +1012,7 @@ class DocsDB:
             self._conn.execute("DELETE FROM doc_chunks")
             self._conn.execute("DELETE FROM versions")
             self._conn.execute("DELETE FROM libraries")
+            self._conn.execute("DELETE FROM embedding_cache")
 
         for line in data.strip().split("\n"):
             if not line.strip():
@@ -11,7 +11,9 @@ Backend selection (always returns a valid backend):
 2. 'litellm' if API keys are configured
 3. 'local' (default, always available)
 
-Embeddings are truncated to fixed dims in server._embed().
+Callers pass the stored dimensions through: LiteLLM forwards them as
+``dimensions`` and qwen3-embed truncates (MRL) before normalizing, so
+vectors come back at the stored size without a client-side slice.
 """
 
 from __future__ import annotations
@@ -236,8 +238,9 @@ class Qwen3EmbedBackend:
     # Default model for qwen3-embed
     DEFAULT_MODEL = "n24q02m/Qwen3-Embedding-0.6B-ONNX"
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, threads: int | None = None):
         self._model_name = model_name or self.DEFAULT_MODEL
+        self._threads = threads
         self._model = None
 
     def _get_model(self):
@@ -254,7 +257,9 @@ class Qwen3EmbedBackend:
                 "(~570 MB download on first run). "
                 "Set API_KEYS to use cloud embedding instead."
             )
-            self._model = TextEmbedding(model_name=self._model_name)
+            self._model = TextEmbedding(
+                model_name=self._model_name, threads=self._threads
+            )
             logger.info("Local embedding model loaded")
         return self._model
 
@@ -290,12 +295,22 @@ class Qwen3EmbedBackend:
         dimensions: int | None = None,
     ) -> list[float]:
         """Embed a query with instruction prefix (asymmetric retrieval)."""
+        return self.embed_queries([text], dimensions)[0]
+
+    def embed_queries(
+        self,
+        texts: list[str],
+        dimensions: int | None = None,
+    ) -> list[list[float]]:
+        """Embed a batch of queries with instruction prefix."""
+        if not texts:
+            return []
+
         model = self._get_model()
         kwargs = {}
         if dimensions and dimensions > 0:
             kwargs["dim"] = dimensions
-        result = list(model.query_embed(text, **kwargs))
-        return result[0].tolist()
+        return [emb.tolist() for emb in model.query_embed(texts, **kwargs)]
 
     def check_available(self) -> int:
         """Check if qwen3-embed is available."""
@@ -326,12 +341,17 @@ def get_backend() -> EmbeddingBackend | None:
     return _backend
 
 
-def init_backend(backend_type: str, model: str | None = None) -> EmbeddingBackend:
+def init_backend(
+    backend_type: str,
+    model: str | None = None,
+    threads: int | None = None,
+) -> EmbeddingBackend:
     """Initialize and cache the embedding backend.
 
     Args:
         backend_type: 'litellm' or 'local'
         model: Model name (required for litellm, optional for local)
+        threads: ONNX session threads for the local backend (None = default)
 
     Returns:
         Initialized backend instance.
@@ -343,7 +363,7 @@ def init_backend(backend_type: str, model: str | None = None) -> EmbeddingBacken
             raise ValueError("model is required for litellm backend")
         _backend = LiteLLMBackend(model)
     elif backend_type == "local":
-        _backend = Qwen3EmbedBackend(model)
+        _backend = Qwen3EmbedBackend(model, threads)
     else:
         raise ValueError(f"Unknown backend type: {backend_type}")
 
@@ -135,8 +135,9 @@ class Qwen3Reranker:
 
     DEFAULT_MODEL = "n24q02m/Qwen3-Reranker-0.6B-ONNX"
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, threads: int | None = None):
         self._model_name = model_name or self.DEFAULT_MODEL
+        self._threads = threads
         self._model = None
 
     def _get_model(self):
@@ -153,7 +154,9 @@ class Qwen3Reranker:
                 "(~570 MB download on first run). "
                 "Set API_KEYS with COHERE_API_KEY to use cloud reranking instead."
             )
-            self._model = TextCrossEncoder(model_name=self._model_name)
+            self._model = TextCrossEncoder(
+                model_name=self._model_name, threads=self._threads
+            )
             logger.info("Local reranker model loaded")
         return self._model
 
@@ -204,12 +207,17 @@ def get_reranker() -> RerankerBackend | None:
     return _backend
 
 
-def init_reranker(backend_type: str, model: str | None = None) -> RerankerBackend:
+def init_reranker(
+    backend_type: str,
+    model: str | None = None,
+    threads: int | None = None,
+) -> RerankerBackend:
     """Initialize and cache the reranker backend.
 
     Args:
         backend_type: 'litellm' or 'local'
         model: Model name (required for litellm, optional for local)
+        threads: ONNX session threads for the local backend (None = default)
 
     Returns:
         Initialized reranker backend instance.
@@ -221,7 +229,7 @@ def init_reranker(backend_type: str, model: str | None = None) -> RerankerBacken
             raise ValueError("model is required for litellm reranker")
         _backend = LiteLLMReranker(model)
     elif backend_type == "local":
-        _backend = Qwen3Reranker(model)
+        _backend = Qwen3Reranker(model, threads)
     else:
         raise ValueError(f"Unknown reranker backend type: {backend_type}")
 
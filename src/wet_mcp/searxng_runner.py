@@ -17,6 +17,7 @@ Resilience features:
 
 import asyncio
 import atexit
+import contextlib
 import json as _json
 import os
 import secrets
@@ -51,6 +52,16 @@ _HEALTH_CHECK_TIMEOUT = 2.0
 # call does not time out.
 _STARTUP_HEALTH_TIMEOUT = 120.0
 
+# How long a URL that passed a health check is trusted without re-checking.
+# Every search still probes /healthz itself and calls
+# ``mark_searxng_unhealthy`` on failure, so a dead instance is never
+# served past its first failed search.
+_VERIFIED_TTL = 60.0
+
+# Timeout for the TCP connect probe run before the HTTP health check on
+# a discovered instance (seconds).
+_PORT_PROBE_TIMEOUT = 0.5
+
 # Discovery file for sharing SearXNG across multiple MCP server instances.
 # Contains {pid, port, owner_pid, started_at} of the running SearXNG process.
 _DISCOVERY_FILE = Path.home() / ".wet-mcp" / "searxng_instance.json"
@@ -93,6 +104,10 @@ _last_restart_time: float = 0.0
 _is_owner: bool = False  # True if this instance started the SearXNG process
 _startup_lock: asyncio.Lock | None = None  # Lazy-init to avoid event loop issues
 
+# Last URL that passed a health check, and when (time.monotonic())
+_verified_url: str | None = None
+_verified_at: float = 0.0
+
 
 def _get_startup_lock() -> asyncio.Lock:
     """Get or create the startup lock (lazy init for event loop safety)."""
@@ -198,6 +213,22 @@ async def _quick_health_check(url: str, retries: int = 3) -> bool:
     return False
 
 
+async def _port_open(port: int) -> bool:
+    """Cheap TCP connect probe: is anything listening on *port*?"""
+    try:
+        _reader, writer = await asyncio.wait_for(
+            asyncio.open_connection("127.0.0.1", port),
+            timeout=_PORT_PROBE_TIMEOUT,
+        )
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    # The peer may reset the probe connection; only the listener matters
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
 async def _try_reuse_existing() -> str | None:
     """Try to reuse a SearXNG instance started by another MCP server.
 
@@ -218,6 +249,12 @@ async def _try_reuse_existing() -> str | None:
         logger.debug(f"Discovery file points to dead process (PID={pid}), ignoring")
         return None
 
+    # A refused connect rules the instance out without paying for the
+    # retried HTTP health check (e.g. the PID was reused by another process)
+    if not await _port_open(port):
+        logger.debug(f"Discovery file points to closed port {port}, ignoring")
+        return None
+
     # Health check the existing instance
     url = f"http://127.0.0.1:{port}"
     if await _quick_health_check(url):
@@ -522,6 +559,7 @@ def _cleanup_process() -> None:
     Non-owner instances just clear their local references.
     """
     global _searxng_process, _searxng_port, _is_owner
+    mark_searxng_unhealthy()
     if _searxng_process is not None:
         if _is_owner:
             try:
@@ -657,7 +695,9 @@ async def ensure_searxng() -> str:
     - SearXNG configuration via settings.yml
     - Graceful fallback to external SearXNG URL
 
-    Uses an asyncio lock to prevent concurrent startup attempts.
+    Uses an asyncio lock to prevent concurrent startup attempts. A URL
+    that passed a health check within ``_VERIFIED_TTL`` is returned
+    straight away, without taking the lock or re-probing.
     """
     global _searxng_process, _searxng_port, _restart_count, _last_restart_time
 
@@ -665,11 +705,28 @@ async def ensure_searxng() -> str:
         logger.info("Auto SearXNG disabled, using external URL")
         return settings.searxng_url
 
+    if _verified_url and time.monotonic() - _verified_at < _VERIFIED_TTL:
+        return _verified_url
+
     # Serialize startup attempts to prevent concurrent starts
     async with _get_startup_lock():
         return await _ensure_searxng_locked()
 
 
+def _mark_verified(url: str) -> str:
+    """Remember *url* as healthy for the ``ensure_searxng`` fast path."""
+    global _verified_url, _verified_at
+    _verified_url = url
+    _verified_at = time.monotonic()
+    return url
+
+
+def mark_searxng_unhealthy() -> None:
+    """Forget the verified URL so the next ``ensure_searxng`` re-checks."""
+    global _verified_url
+    _verified_url = None
+
+
 async def _ensure_searxng_locked() -> str:
     """Inner ensure_searxng logic, called under lock."""
     global _searxng_process, _searxng_port, _restart_count, _last_restart_time
@@ -684,7 +741,7 @@ async def _ensure_searxng_locked() -> str:
         # Verify port is actually responding (process may be stuck)
         if await _quick_health_check(url, retries=1):
             logger.debug(f"SearXNG already running at {url}")
-            return url
+            return _mark_verified(url)
         # Process alive but not serving — kill and restart
         logger.warning(
             f"SearXNG process alive (PID={_searxng_process.pid}) "
@@ -698,7 +755,7 @@ async def _ensure_searxng_locked() -> str:
     reused_url = await _try_reuse_existing()
     if reused_url:
         logger.info(f"Reusing existing SearXNG instance at {reused_url}")
-        return reused_url
+        return _mark_verified(reused_url)
 
     # Process is dead or not started — need to (re)start
     if _searxng_process is not None:
@@ -751,7 +808,7 @@ async def _ensure_searxng_locked() -> str:
     if url is not None:
         # Successful start — reset restart counter
         _restart_count = 0
-        return url
+        return _mark_verified(url)
 
     logger.warning("SearXNG start failed, falling back to external URL")
     return settings.searxng_url
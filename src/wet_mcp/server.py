@@ -2,22 +2,31 @@
 
 import asyncio
 import functools
+import hashlib
 import json
 import os
+import re
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from importlib.resources import files
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
+import anyio
 from loguru import logger
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
+from wet_mcp import embedder as _embedder
+from wet_mcp import reranker as _reranker
 from wet_mcp.cache import WebCache
 from wet_mcp.config import settings
 from wet_mcp.db import DocsDB
 from wet_mcp.searxng_runner import ensure_searxng, stop_searxng
 from wet_mcp.security import wrap_external_content
+from wet_mcp.sources import crawler as _crawler
+from wet_mcp.sources import docs as _docs
 from wet_mcp.sources.crawler import (
     crawl as _crawl,
 )
@@ -31,7 +40,12 @@ from wet_mcp.sources.crawler import (
 from wet_mcp.sources.crawler import (
     sitemap as _sitemap,
 )
-from wet_mcp.sources.searxng import search as searxng_search
+from wet_mcp.sources.searxng import (
+    search as searxng_search,
+)
+from wet_mcp.sources.searxng import (
+    search_results as searxng_search_results,
+)
 
 # Configure logging
 logger.remove()
@@ -58,6 +72,40 @@ _web_cache: WebCache | None = None
 _docs_db: DocsDB | None = None
 _embedding_dims: int = 0
 
+# Bounded worker pool for blocking work (ONNX inference, API probes,
+# setup). Keeps concurrent tool calls from growing the default executor
+# to its cpu_count + 4 limit of GIL-contending threads.
+_CPU_POOL_WORKERS = min(8, os.cpu_count() or 1)
+_cpu_pool: ThreadPoolExecutor | None = None
+
+# Cloud embedding requests only wait on the network; a separate pool keeps a
+# burst of docs searches from queueing behind setup and crawl4ai import.
+# Sized per core like _cpu_pool, with room for one batch's concurrent
+# requests (_EMBED_REQUEST_CONCURRENCY) even on a single core.
+_EMBED_POOL_WORKERS = min(32, 4 * (os.cpu_count() or 1))
+_embed_pool: ThreadPoolExecutor | None = None
+
+
+async def _to_thread(fn, *args):
+    """Run a blocking call on the server worker pool.
+
+    Falls back to the loop's default executor outside the lifespan (tests,
+    direct helper calls).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cpu_pool, functools.partial(fn, *args))
+
+
+async def _to_embed_thread(backend, fn, *args):
+    """Run an embedding call for ``backend`` off the event loop.
+
+    Cloud backends use the embedding I/O pool; local ONNX inference stays
+    on the CPU-bounded worker pool.
+    """
+    pool = _embed_pool if isinstance(backend, _embedder.LiteLLMBackend) else _cpu_pool
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args))
+
 
 async def _warmup_searxng() -> None:
     """Run heavy setup and pre-warm SearXNG in background.
@@ -67,27 +115,63 @@ async def _warmup_searxng() -> None:
     try:
         from wet_mcp.setup import run_auto_setup
 
-        await asyncio.to_thread(run_auto_setup)
+        # First run installs SearXNG + Playwright, which the steps below
+        # need; once the setup marker exists this returns immediately.
+        await _to_thread(run_auto_setup)
+    except Exception as e:
+        logger.debug(f"SearXNG pre-warm failed (non-fatal): {e}")
+        return
 
-        # Pre-import crawl4ai
-        await asyncio.to_thread(__import__, "crawl4ai")
+    async def _import_crawl4ai() -> None:
+        await _to_thread(__import__, "crawl4ai")
         logger.info("Crawl4AI background load complete")
 
+    async def _start_searxng() -> None:
         from wet_mcp.searxng_runner import ensure_searxng
 
         url = await ensure_searxng()
         logger.info(f"SearXNG pre-warmed at {url}")
-    except Exception as e:
-        logger.debug(f"SearXNG pre-warm failed (non-fatal): {e}")
+
+    # Independent: the crawl4ai import is CPU/disk bound, SearXNG startup
+    # mostly waits on the subprocess health check.
+    results = await asyncio.gather(
+        _import_crawl4ai(), _start_searxng(), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.debug(f"SearXNG pre-warm failed (non-fatal): {result}")
+
+
+async def _warm_local_models() -> None:
+    """Run one tiny inference on local ONNX models.
+
+    Loads the session (and triggers graph optimization) in the background so
+    the first docs search does not pay for it -- ``check_available`` may
+    have been skipped thanks to the cached probe. Cloud backends are left
+    alone to avoid a billable request.
+    """
+    backend = _embedder.get_backend()
+    if isinstance(backend, _embedder.Qwen3EmbedBackend):
+        await _to_thread(backend.embed_single, "warmup", _embedding_dims)
+    reranker = _reranker.get_reranker()
+    if isinstance(reranker, _reranker.Qwen3Reranker):
+        await _to_thread(reranker.rerank, "warmup", ["warmup"], 1)
 
 
 @asynccontextmanager
 async def _lifespan(_server: FastMCP):
     """Server lifespan: startup SearXNG, init cache/docs DB, cleanup on shutdown."""
-    global _web_cache, _docs_db, _embedding_dims
+    global _web_cache, _docs_db, _embedding_dims, _cpu_pool, _embed_pool
 
     logger.info("Starting WET MCP Server...")
 
+    _cpu_pool = ThreadPoolExecutor(
+        max_workers=_CPU_POOL_WORKERS, thread_name_prefix="wet-worker"
+    )
+    _embed_pool = ThreadPoolExecutor(
+        max_workers=_EMBED_POOL_WORKERS, thread_name_prefix="wet-embed"
+    )
+
     # 1. Setup API keys (+ aliases like GOOGLE_API_KEY -> GEMINI_API_KEY)
     from wet_mcp.config import settings
 
@@ -125,9 +209,14 @@ async def _lifespan(_server: FastMCP):
     async def _init_backends_task():
         try:
             await _init_embedding_backend(keys)
-            await _init_reranker_backend()
+            await _init_reranker_backend(keys)
         except Exception as e:
             logger.error(f"Background backend init failed: {e}")
+            return
+        try:
+            await _warm_local_models()
+        except Exception as e:
+            logger.debug(f"Local model warmup failed (non-fatal): {e}")
 
     asyncio.create_task(_init_backends_task())
 
@@ -176,6 +265,58 @@ async def _lifespan(_server: FastMCP):
 
     stop_searxng()
 
+    _cpu_pool.shutdown(wait=False, cancel_futures=True)
+    _cpu_pool = None
+    _embed_pool.shutdown(wait=False, cancel_futures=True)
+    _embed_pool = None
+
+
+def _probe_params(kind: str, backend_type: str, model: str, keys: dict) -> dict:
+    """Cache params identifying a backend probe: config + API-key fingerprint."""
+    fingerprint = hashlib.sha256(
+        json.dumps(keys, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return {
+        "kind": kind,
+        "backend": backend_type,
+        "model": model,
+        "keys": fingerprint,
+    }
+
+
+async def _check_cached(probe: dict, check):
+    """Run a backend ``check_available`` unless a previous start cached it.
+
+    Only positive results are cached -- a failed probe may be transient
+    (network, rate limit) and should be retried on the next start.
+    """
+    if _web_cache:
+        cached = _web_cache.get("backend_probe", probe)
+        if cached:
+            return json.loads(cached)
+    result = await _to_thread(check)
+    if result and _web_cache:
+        _web_cache.set("backend_probe", probe, json.dumps(result))
+    return result
+
+
+_backend_probes_dropped = False
+
+
+async def _forget_backend_probes(kind: str, error: Exception) -> None:
+    """Drop cached availability probes after a failed backend call.
+
+    A revoked key or removed model is otherwise trusted until the probe
+    TTL expires; the next start re-probes instead. Runs once per process.
+    """
+    global _backend_probes_dropped
+    if _backend_probes_dropped:
+        return
+    _backend_probes_dropped = True
+    logger.warning(f"{kind} backend call failed, re-probing on next start: {error}")
+    if _web_cache:
+        await asyncio.to_thread(_web_cache.clear, "backend_probe")
+
 
 async def _init_embedding_backend(keys: dict) -> None:
     """Initialize the embedding backend based on config.
@@ -185,7 +326,6 @@ async def _init_embedding_backend(keys: dict) -> None:
     - local: always available (GGUF if GPU + llama-cpp, else ONNX)
     """
     global _embedding_dims
-    from wet_mcp.embedder import init_backend
 
     backend_type = settings.resolve_embedding_backend()
 
@@ -194,8 +334,11 @@ async def _init_embedding_backend(keys: dict) -> None:
         if model:
             # Explicit model -- validate it
             try:
-                backend = await asyncio.to_thread(init_backend, "litellm", model)
-                native_dims = await asyncio.to_thread(backend.check_available)
+                backend = await _to_thread(_embedder.init_backend, "litellm", model)
+                native_dims = await _check_cached(
+                    _probe_params("embedding", "litellm", model, keys),
+                    backend.check_available,
+                )
                 if native_dims > 0:
                     if _embedding_dims == 0:
                         _embedding_dims = _DEFAULT_EMBEDDING_DIMS
@@ -207,14 +350,39 @@ async def _init_embedding_backend(keys: dict) -> None:
             except Exception as e:
                 logger.warning(f"Embedding model {model} not available: {e}")
         elif keys:
-            # Auto-detect: try candidate models
-            for candidate in _EMBEDDING_CANDIDATES:
+            # Auto-detect: probe every candidate concurrently and keep the
+            # highest-priority one that works, so wall time is the slowest
+            # probe rather than the sum. The candidate that won last time is
+            # ranked first. Probes use standalone backends because
+            # init_backend() replaces the shared singleton.
+            auto_probe = _probe_params("embedding", "litellm", "auto", keys)
+            cached = _web_cache.get("backend_probe", auto_probe) if _web_cache else None
+            preferred = json.loads(cached) if cached else None
+            candidates = sorted(_EMBEDDING_CANDIDATES, key=lambda c: c != preferred)
+
+            async def _probe_candidate(candidate: str) -> int:
                 try:
-                    backend = await asyncio.to_thread(
-                        init_backend, "litellm", candidate
+                    backend = await _to_thread(_embedder.LiteLLMBackend, candidate)
+                    return await _check_cached(
+                        _probe_params("embedding", "litellm", candidate, keys),
+                        backend.check_available,
                     )
-                    native_dims = await asyncio.to_thread(backend.check_available)
+                except Exception:
+                    return 0
+
+            probes = [
+                (candidate, asyncio.create_task(_probe_candidate(candidate)))
+                for candidate in candidates
+            ]
+            try:
+                for candidate, probe in probes:
+                    native_dims = await probe
                     if native_dims > 0:
+                        await _to_thread(_embedder.init_backend, "litellm", candidate)
+                        if _web_cache and candidate != preferred:
+                            _web_cache.set(
+                                "backend_probe", auto_probe, json.dumps(candidate)
+                            )
                         if _embedding_dims == 0:
                             _embedding_dims = _DEFAULT_EMBEDDING_DIMS
                         logger.info(
@@ -222,16 +390,22 @@ async def _init_embedding_backend(keys: dict) -> None:
                             f"(native={native_dims}, stored={_embedding_dims})"
                         )
                         return
-                except Exception:
-                    continue
+            finally:
+                for _, probe in probes:
+                    probe.cancel()
         # Cloud not available -- fallback to local
         logger.warning("Cloud embedding not available, using local fallback")
 
     # Local backend (always available)
     local_model = settings.resolve_local_embedding_model()
     try:
-        backend = await asyncio.to_thread(init_backend, "local", local_model)
-        native_dims = await asyncio.to_thread(backend.check_available)
+        backend = await _to_thread(
+            _embedder.init_backend, "local", local_model, settings.onnx_threads or None
+        )
+        native_dims = await _check_cached(
+            _probe_params("embedding", "local", local_model or "", {}),
+            backend.check_available,
+        )
         if native_dims > 0:
             if _embedding_dims == 0:
                 _embedding_dims = _DEFAULT_EMBEDDING_DIMS
@@ -245,7 +419,7 @@ async def _init_embedding_backend(keys: dict) -> None:
         logger.error(f"Local embedding init failed: {e}")
 
 
-async def _init_reranker_backend() -> None:
+async def _init_reranker_backend(keys: dict | None = None) -> None:
     """Initialize the reranker backend based on config.
 
     Always initializes a backend unless reranking is disabled:
@@ -258,14 +432,15 @@ async def _init_reranker_backend() -> None:
         logger.info("Reranking disabled")
         return
 
-    from wet_mcp.reranker import init_reranker
-
     if rerank_backend_type == "litellm":
         model = settings.resolve_rerank_model()
         if model:
             try:
-                reranker = await asyncio.to_thread(init_reranker, "litellm", model)
-                available = await asyncio.to_thread(reranker.check_available)
+                reranker = await _to_thread(_reranker.init_reranker, "litellm", model)
+                available = await _check_cached(
+                    _probe_params("rerank", "litellm", model, keys or {}),
+                    reranker.check_available,
+                )
                 if available:
                     logger.info(f"Reranker: {model} (cloud)")
                     return
@@ -277,8 +452,13 @@ async def _init_reranker_backend() -> None:
     # Local backend (always available)
     local_model = settings.resolve_local_rerank_model()
     try:
-        reranker = await asyncio.to_thread(init_reranker, "local", local_model)
-        available = await asyncio.to_thread(reranker.check_available)
+        reranker = await _to_thread(
+            _reranker.init_reranker, "local", local_model, settings.onnx_threads or None
+        )
+        available = await _check_cached(
+            _probe_params("rerank", "local", local_model or "", {}),
+            reranker.check_available,
+        )
         if available:
             logger.info(f"Reranker: local {local_model}")
         else:
@@ -290,6 +470,75 @@ async def _init_reranker_backend() -> None:
 # --- Helpers ---
 
 
+# Concurrent _embed() calls are coalesced into one backend call: the first
+# request opens a batch and schedules its flush _EMBED_MAX_LATENCY later;
+# requests arriving before then join it, and a batch that reaches
+# _EMBED_MAX_BATCH is flushed at once. Open batches are keyed by the running
+# loop so a server restarted on a new loop never joins a stale one.
+_EMBED_MAX_BATCH = 8
+_EMBED_MAX_LATENCY = 0.01
+_embed_pending: dict[
+    tuple[asyncio.AbstractEventLoop, bool],
+    tuple[list[tuple[str, asyncio.Future]], asyncio.TimerHandle],
+] = {}
+# Strong references to scheduled flushes; the loop only keeps weak ones.
+_embed_flush_tasks: set[asyncio.Task] = set()
+
+# Recent _embed() results, so an agent re-issuing the same docs query skips
+# the backend round trip. Keys are model-scoped like the persistent cache.
+_EMBED_MEMO_SIZE = 1024
+_embed_memo: OrderedDict[tuple[bytes, bool], list[float]] = OrderedDict()
+
+
+async def _run_embed_batch(
+    backend, batch: list[tuple[str, asyncio.Future]], is_query: bool
+) -> None:
+    """Embed a coalesced batch and resolve each caller's future."""
+    texts = [text for text, _ in batch]
+    try:
+        if is_query and isinstance(backend, _embedder.Qwen3EmbedBackend):
+            vectors = await _to_embed_thread(
+                backend, backend.embed_queries, texts, _embedding_dims
+            )
+        else:
+            vectors = await _to_embed_thread(
+                backend, backend.embed_texts, texts, _embedding_dims
+            )
+        if len(vectors) != len(batch):
+            raise ValueError(
+                f"Embedding backend returned {len(vectors)} vectors "
+                f"for {len(batch)} texts"
+            )
+    except Exception as e:
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_exception(e)
+        await _forget_backend_probes("Embedding", e)
+        return
+    for (_, fut), vector in zip(batch, vectors, strict=True):
+        if not fut.done():
+            fut.set_result(vector)
+
+
+def _flush_embed_batch(
+    backend,
+    key: tuple[asyncio.AbstractEventLoop, bool],
+    batch: list[tuple[str, asyncio.Future]],
+) -> None:
+    """Close *batch* and start embedding it, keeping the task referenced.
+
+    Called by the batch timer, or directly once the batch is full.
+    """
+    pending = _embed_pending.get(key)
+    if pending is not None and pending[0] is batch:
+        del _embed_pending[key]
+        pending[1].cancel()
+    loop, is_query = key
+    task = loop.create_task(_run_embed_batch(backend, batch, is_query))
+    _embed_flush_tasks.add(task)
+    task.add_done_callback(_embed_flush_tasks.discard)
+
+
 async def _embed(text: str, is_query: bool = False) -> list[float] | None:
     """Embed text if backend is available.
 
@@ -298,34 +547,168 @@ async def _embed(text: str, is_query: bool = False) -> list[float] | None:
         is_query: If True, use query_embed for instruction-aware asymmetric
             retrieval (Qwen3). Document embeddings stay raw.
     """
-    from wet_mcp.embedder import Qwen3EmbedBackend, get_backend
-
-    backend = get_backend()
+    backend = _embedder.get_backend()
     if not backend:
         return None
+
+    memo_key = (_embedding_cache_keys([text])[0], is_query)
+    vector = _embed_memo.get(memo_key)
+    if vector is not None:
+        _embed_memo.move_to_end(memo_key)
+        return vector
+
+    loop = asyncio.get_running_loop()
+    key = (loop, is_query)
+    fut = loop.create_future()
+    pending = _embed_pending.get(key)
+    if pending is None:
+        batch: list[tuple[str, asyncio.Future]] = []
+        timer = loop.call_later(
+            _EMBED_MAX_LATENCY, _flush_embed_batch, backend, key, batch
+        )
+        _embed_pending[key] = (batch, timer)
+    else:
+        batch = pending[0]
+    batch.append((text, fut))
+    if len(batch) >= _EMBED_MAX_BATCH:
+        # Full: flush now instead of waiting out the timer
+        _flush_embed_batch(backend, key, batch)
+
     try:
-        if is_query and isinstance(backend, Qwen3EmbedBackend):
-            return await asyncio.to_thread(
-                backend.embed_single_query, text, _embedding_dims
-            )
-        return await asyncio.to_thread(backend.embed_single, text, _embedding_dims)
+        vector = await fut
     except Exception as e:
         logger.debug(f"Embedding failed: {e}")
         return None
+    if vector:
+        _embed_memo[memo_key] = vector
+        if len(_embed_memo) > _EMBED_MEMO_SIZE:
+            _embed_memo.popitem(last=False)
+    return vector
+
 
+# Cloud embedding requests in flight per _embed_batch() call. LiteLLM splits
+# large inputs into provider-sized requests but sends them one at a time.
+_EMBED_REQUEST_CONCURRENCY = 4
 
-async def _embed_batch(texts: list[str]) -> list[list[float]] | None:
-    """Embed batch of texts if backend is available."""
-    from wet_mcp.embedder import get_backend
 
-    backend = get_backend()
+async def _embed_batch(
+    texts: list[str], backend=None, dims: int | None = None
+) -> list[list[float]] | None:
+    """Embed batch of texts if backend is available.
+
+    For cloud backends the provider-sized sub-batches are sent
+    concurrently. A failed sub-batch yields empty vectors at its positions;
+    ``None`` is returned only when nothing could be embedded.
+
+    ``backend`` and ``dims`` default to the active backend; the background
+    indexer passes the ones it captured at start.
+    """
+    if backend is None:
+        backend = _embedder.get_backend()
+    if dims is None:
+        dims = _embedding_dims
     if not backend:
         return None
-    try:
-        return await asyncio.to_thread(backend.embed_texts, texts, _embedding_dims)
-    except Exception as e:
-        logger.debug(f"Batch embedding failed: {e}")
+    size = (
+        backend.MAX_BATCH_SIZE
+        if isinstance(backend, _embedder.LiteLLMBackend)
+        else len(texts)
+    )
+    if len(texts) <= size:
+        try:
+            return await _to_embed_thread(backend, backend.embed_texts, texts, dims)
+        except Exception as e:
+            logger.debug(f"Batch embedding failed: {e}")
+            await _forget_backend_probes("Embedding", e)
+            return None
+
+    sem = asyncio.Semaphore(_EMBED_REQUEST_CONCURRENCY)
+
+    async def _one(sub: list[str]) -> list[list[float]] | None:
+        async with sem:
+            try:
+                return await _to_embed_thread(backend, backend.embed_texts, sub, dims)
+            except Exception as e:
+                logger.debug(f"Batch embedding failed for {len(sub)} texts: {e}")
+                await _forget_backend_probes("Embedding", e)
+                return None
+
+    subs = [texts[i : i + size] for i in range(0, len(texts), size)]
+    parts = await asyncio.gather(*(_one(sub) for sub in subs))
+    if all(part is None for part in parts):
         return None
+    vectors: list[list[float]] = []
+    for sub, part in zip(subs, parts, strict=True):
+        vectors.extend(part if part is not None else [[] for _ in sub])
+    return vectors
+
+
+def _embedding_fingerprint(backend=None, dims: int | None = None) -> str:
+    """Identify an embedding space: backend, model and stored dims.
+
+    Defaults to the active backend and dims.
+    """
+    if backend is None:
+        backend = _embedder.get_backend()
+    if dims is None:
+        dims = _embedding_dims
+    model = getattr(backend, "model", None) or getattr(backend, "_model_name", "")
+    return f"{type(backend).__name__}:{model}:{dims}"
+
+
+def _embedding_cache_keys(
+    texts: list[str], backend=None, dims: int | None = None
+) -> list[bytes]:
+    """Content hashes for ``texts`` under an embedding model.
+
+    The backend, model and stored dimensions are part of the key, so
+    switching models never serves vectors from another embedding space.
+    Defaults to the active backend and dims.
+    """
+    prefix = f"{_embedding_fingerprint(backend, dims)}\0".encode()
+    return [
+        hashlib.blake2b(prefix + text.encode(), digest_size=16).digest()
+        for text in texts
+    ]
+
+
+async def _embed_batch_cached(
+    texts: list[str], docs_db=None, backend=None, dims: int | None = None
+) -> list[list[float]] | None:
+    """``_embed_batch`` backed by the docs DB's content-addressed cache.
+
+    Only texts never embedded before (with the current model) reach the
+    backend, so re-indexing a library costs only its changed chunks.
+    Omitted arguments default to the active docs DB, backend and dims.
+    """
+    if docs_db is None:
+        docs_db = _docs_db
+    if backend is None:
+        backend = _embedder.get_backend()
+    if dims is None:
+        dims = _embedding_dims
+    if not docs_db or backend is None:
+        return await _embed_batch(texts, backend, dims)
+
+    keys = _embedding_cache_keys(texts, backend, dims)
+    cached = docs_db.get_cached_embeddings(list(set(keys)))
+    # First position of each uncached text: duplicates are embedded once
+    first: dict[bytes, int] = {}
+    for i, key in enumerate(keys):
+        if key not in cached:
+            first.setdefault(key, i)
+    missing = list(first.values())
+    if missing:
+        fresh = await _embed_batch([texts[i] for i in missing], backend, dims)
+        if fresh is None:
+            return None
+        new_items = [
+            (keys[i], vec) for i, vec in zip(missing, fresh, strict=False) if vec
+        ]
+        docs_db.cache_embeddings(new_items)
+        cached.update(new_items)
+        logger.debug("Embedded {}/{} chunks (rest cached)", len(missing), len(texts))
+    return [cached.get(key, []) for key in keys]
 
 
 async def _rerank_results(
@@ -336,26 +719,27 @@ async def _rerank_results(
     """Rerank search results if reranker is available.
 
     Falls back to original results if reranking fails or is unavailable.
+    Scores are written onto the result dicts themselves (every caller owns
+    freshly decoded results), so no per-result copy is made.
     """
-    from wet_mcp.reranker import get_reranker
-
-    reranker = get_reranker()
+    reranker = _reranker.get_reranker()
     if not reranker or len(results) <= top_n:
         return results[:top_n]
 
     try:
         documents = [r["content"] for r in results]
-        ranked = await asyncio.to_thread(reranker.rerank, query, documents, top_n)
+        ranked = await _to_thread(reranker.rerank, query, documents, top_n)
         if ranked:
             reranked = []
             for idx, score in ranked:
                 if idx < len(results):
-                    result = results[idx].copy()
+                    result = results[idx]
                     result["score"] = round(score, 4)
                     reranked.append(result)
             return reranked
     except Exception as e:
         logger.debug(f"Reranking failed, using original order: {e}")
+        await _forget_backend_probes("Rerank", e)
 
     return results[:top_n]
 
@@ -383,7 +767,8 @@ def _wrap_tool(tool_name: str):
 
     Encapsulates untrusted external content in XML boundary tags and appends
     a security warning instructing the LLM to treat the content as data only.
-    Error responses are passed through unwrapped.
+    Error responses are passed through unwrapped. Tools may return a list
+    of string chunks, which are joined with the markers in one pass.
     """
 
     def decorator(func):
@@ -409,36 +794,36 @@ _FALLBACK_TIMEOUT = 60  # SearXNG fallback fetch
 async def _with_timeout(coro, action: str) -> str:
     """Wrap coroutine with hard timeout.
 
-    Uses ``asyncio.wait`` instead of ``asyncio.wait_for`` because
-    Playwright / Crawl4AI may suppress ``CancelledError`` internally,
-    causing ``wait_for`` to block indefinitely.  ``asyncio.wait``
-    returns immediately when the deadline expires regardless of whether
-    the inner task cooperates with cancellation.
+    The task is awaited through ``asyncio.shield`` inside
+    ``asyncio.timeout``: on expiry only the wait is cancelled, so the
+    deadline holds even though Playwright / Crawl4AI may suppress
+    ``CancelledError`` internally (which would make a plain
+    ``wait_for`` block indefinitely).
 
     After cancellation the task is given a brief grace period to release
     resources (browser tabs, network connections) before being abandoned.
+    If the caller itself is cancelled, the inner task is cancelled with it
+    instead of being left running.
     """
     timeout = settings.tool_timeout
     if timeout <= 0:
         return await coro
 
     task = asyncio.create_task(coro)
-    done, _pending = await asyncio.wait({task}, timeout=timeout)
-
-    if done:
-        # Propagate any exception raised by the task
-        return task.result()
+    try:
+        async with asyncio.timeout(timeout) as deadline:
+            return await asyncio.shield(task)
+    except TimeoutError:
+        if not deadline.expired():
+            raise  # raised by the task itself
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
 
-    # Hard timeout -- cancel and wait briefly for cleanup
+    # Hard timeout -- cancel and wait briefly for cleanup.
     task.cancel()
     logger.warning(f"Tool '{action}' timed out after {timeout}s, cancelling...")
-
-    # Give the task a grace period to clean up (close browser pages, etc.)
-    try:
-        await asyncio.wait_for(asyncio.shield(task), timeout=_CANCEL_GRACE_PERIOD)
-    except (asyncio.CancelledError, TimeoutError, Exception):
-        # Task either cancelled cleanly, timed out again, or raised -- all OK
-        pass
+    await asyncio.wait({task}, timeout=_CANCEL_GRACE_PERIOD)
 
     logger.error(f"Tool '{action}' timed out after {timeout}s")
     return (
@@ -447,10 +832,130 @@ async def _with_timeout(coro, action: str) -> str:
     )
 
 
+class _IndexedDocsResult(str):
+    """A docs answer ranked from a finished index.
+
+    A ``str`` subclass rather than a marker in the JSON: page content in
+    the results can contain any text, but cannot produce this type.
+    """
+
+    __slots__ = ()
+
+
+async def _cached(action: str, cache_params: dict, run, cacheable=None) -> str:
+    """Serve ``action`` from the web cache, else ``await run()`` and store it.
+
+    Error results are never cached; ``cacheable(result)`` can narrow what
+    is stored further.
+    """
+    # Bound once: a local is cheaper than repeated global lookups and stays
+    # consistent if the lifespan swaps the module global mid-request.
+    web_cache = _web_cache
+    if web_cache:
+        cached = await web_cache.aget(action, cache_params)
+        if cached:
+            return cached
+    result = await run()
+    if (
+        web_cache
+        and not result.startswith("Error")
+        and (cacheable is None or cacheable(result))
+    ):
+        await web_cache.aset(action, cache_params, result)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # search tool: search, research, docs
 # ---------------------------------------------------------------------------
 
+# Each tool dispatches through a dict built once at import: one lookup and
+# one call instead of walking a match statement. Handlers receive every tool
+# argument as a keyword and ignore the ones they don't use.
+
+
+async def _search_web(query, categories, max_results, **_) -> str:
+    if not query:
+        return "Error: query is required for search action"
+
+    async def run() -> str:
+        try:
+            searxng_url = await asyncio.wait_for(
+                ensure_searxng(), timeout=_SEARXNG_TIMEOUT
+            )
+        except TimeoutError:
+            return f"Error: SearXNG startup timed out ({_SEARXNG_TIMEOUT}s). Try again or check logs."
+        except (SystemExit, Exception) as exc:
+            return f"Error: SearXNG startup failed: {exc}"
+        return await _with_timeout(
+            searxng_search(
+                searxng_url=searxng_url,
+                query=query,
+                categories=categories,
+                max_results=max_results,
+            ),
+            "search",
+        )
+
+    cache_params = {
+        "query": query,
+        "categories": categories,
+        "max_results": max_results,
+    }
+    return await _cached("search", cache_params, run)
+
+
+async def _search_research(query, max_results, **_) -> str:
+    if not query:
+        return "Error: query is required for research action"
+    return await _cached(
+        "research",
+        {"query": query, "max_results": max_results},
+        lambda: _with_timeout(
+            _do_research(query=query, max_results=max_results),
+            "research",
+        ),
+    )
+
+
+async def _search_docs(library, query, language, version, limit, **_) -> str:
+    if not library:
+        return "Error: library is required for docs action"
+    if not query:
+        return "Error: query is required for docs action"
+    # Scoped by embedding space so a model switch never serves stale
+    # rankings. Only answers from a finished index are stored: the
+    # "indexing in progress" fallback changes once indexing completes.
+    return await _cached(
+        "docs",
+        {
+            "library": library,
+            "query": query,
+            "language": language,
+            "version": version,
+            "limit": limit,
+            "embedding": _embedding_fingerprint(),
+        },
+        lambda: _with_timeout(
+            _do_docs_search(
+                library=library,
+                query=query,
+                language=language,
+                version=version,
+                limit=limit,
+            ),
+            "docs",
+        ),
+        cacheable=lambda result: isinstance(result, _IndexedDocsResult),
+    )
+
+
+_SEARCH_ACTIONS = {
+    "search": _search_web,
+    "research": _search_research,
+    "docs": _search_docs,
+}
+
 
 @mcp.tool(
     annotations=ToolAnnotations(
@@ -476,77 +981,20 @@ async def search(
     - docs: Search library documentation with auto-indexing (requires library + query, specify language for disambiguation)
     Use `help` tool for full documentation.
     """
-    match action:
-        case "search":
-            if not query:
-                return "Error: query is required for search action"
-            cache_params = {
-                "query": query,
-                "categories": categories,
-                "max_results": max_results,
-            }
-            if _web_cache:
-                cached = _web_cache.get("search", cache_params)
-                if cached:
-                    return cached
-            try:
-                searxng_url = await asyncio.wait_for(
-                    ensure_searxng(), timeout=_SEARXNG_TIMEOUT
-                )
-            except TimeoutError:
-                return f"Error: SearXNG startup timed out ({_SEARXNG_TIMEOUT}s). Try again or check logs."
-            except (SystemExit, Exception) as exc:
-                return f"Error: SearXNG startup failed: {exc}"
-            result = await _with_timeout(
-                searxng_search(
-                    searxng_url=searxng_url,
-                    query=query,
-                    categories=categories,
-                    max_results=max_results,
-                ),
-                "search",
-            )
-            if _web_cache and not result.startswith("Error"):
-                _web_cache.set("search", cache_params, result)
-            return result
-
-        case "research":
-            if not query:
-                return "Error: query is required for research action"
-            cache_params = {"query": query, "max_results": max_results}
-            if _web_cache:
-                cached = _web_cache.get("research", cache_params)
-                if cached:
-                    return cached
-            result = await _with_timeout(
-                _do_research(query=query, max_results=max_results),
-                "research",
-            )
-            if _web_cache and not result.startswith("Error"):
-                _web_cache.set("research", cache_params, result)
-            return result
-
-        case "docs":
-            if not library:
-                return "Error: library is required for docs action"
-            if not query:
-                return "Error: query is required for docs action"
-            return await _with_timeout(
-                _do_docs_search(
-                    library=library,
-                    query=query,
-                    language=language,
-                    version=version,
-                    limit=limit,
-                ),
-                "docs",
-            )
-
-        case _:
-            return (
-                f"Error: Unknown action '{action}'. "
-                "Valid actions: search, research, docs"
-            )
+    handler = _SEARCH_ACTIONS.get(action)
+    if handler is None:
+        return (
+            f"Error: Unknown action '{action}'. Valid actions: search, research, docs"
+        )
+    return await handler(
+        query=query,
+        library=library,
+        version=version,
+        language=language,
+        categories=categories,
+        max_results=max_results,
+        limit=limit,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -554,6 +1002,58 @@ async def search(
 # ---------------------------------------------------------------------------
 
 
+async def _extract_pages(urls, format, stealth, **_) -> str:
+    if not urls:
+        return "Error: urls is required for extract action"
+    return await _cached(
+        "extract",
+        {"urls": sorted(urls), "format": format, "stealth": stealth},
+        lambda: _with_timeout(
+            _extract(urls=urls, format=format, stealth=stealth),
+            "extract",
+        ),
+    )
+
+
+async def _extract_crawl(urls, depth, max_pages, format, stealth, **_) -> str:
+    if not urls:
+        return "Error: urls is required for crawl action"
+    return await _cached(
+        "crawl",
+        {"urls": sorted(urls), "depth": depth, "max_pages": max_pages},
+        lambda: _with_timeout(
+            _crawl(
+                urls=urls,
+                depth=depth,
+                max_pages=max_pages,
+                format=format,
+                stealth=stealth,
+            ),
+            "crawl",
+        ),
+    )
+
+
+async def _extract_map(urls, depth, max_pages, **_) -> str:
+    if not urls:
+        return "Error: urls is required for map action"
+    return await _cached(
+        "map",
+        {"urls": sorted(urls), "depth": depth, "max_pages": max_pages},
+        lambda: _with_timeout(
+            _sitemap(urls=urls, depth=depth, max_pages=max_pages),
+            "map",
+        ),
+    )
+
+
+_EXTRACT_ACTIONS = {
+    "extract": _extract_pages,
+    "crawl": _extract_crawl,
+    "map": _extract_map,
+}
+
+
 @mcp.tool(
     annotations=ToolAnnotations(
         readOnlyHint=True,
@@ -575,73 +1075,66 @@ async def extract(
     - map: Discover site structure without content (requires urls)
     Use `help` tool for full documentation.
     """
-    match action:
-        case "extract":
-            if not urls:
-                return "Error: urls is required for extract action"
-            cache_params = {"urls": sorted(urls), "format": format, "stealth": stealth}
-            if _web_cache:
-                cached = _web_cache.get("extract", cache_params)
-                if cached:
-                    return cached
-            result = await _with_timeout(
-                _extract(urls=urls, format=format, stealth=stealth),
-                "extract",
-            )
-            if _web_cache and not result.startswith("Error"):
-                _web_cache.set("extract", cache_params, result)
-            return result
-
-        case "crawl":
-            if not urls:
-                return "Error: urls is required for crawl action"
-            cache_params = {
-                "urls": sorted(urls),
-                "depth": depth,
-                "max_pages": max_pages,
-            }
-            if _web_cache:
-                cached = _web_cache.get("crawl", cache_params)
-                if cached:
-                    return cached
-            result = await _with_timeout(
-                _crawl(
-                    urls=urls,
-                    depth=depth,
-                    max_pages=max_pages,
-                    format=format,
-                    stealth=stealth,
-                ),
-                "crawl",
-            )
-            if _web_cache and not result.startswith("Error"):
-                _web_cache.set("crawl", cache_params, result)
-            return result
-
-        case "map":
-            if not urls:
-                return "Error: urls is required for map action"
-            cache_params = {
-                "urls": sorted(urls),
-                "depth": depth,
-                "max_pages": max_pages,
-            }
-            if _web_cache:
-                cached = _web_cache.get("map", cache_params)
-                if cached:
-                    return cached
-            result = await _with_timeout(
-                _sitemap(urls=urls, depth=depth, max_pages=max_pages),
-                "map",
-            )
-            if _web_cache and not result.startswith("Error"):
-                _web_cache.set("map", cache_params, result)
-            return result
+    handler = _EXTRACT_ACTIONS.get(action)
+    if handler is None:
+        return f"Error: Unknown action '{action}'. Valid actions: extract, crawl, map"
+    if urls:
+        # Drop duplicates once, keeping caller order for the results; the
+        # handlers sort this deduped list for the cache key.
+        urls = list(dict.fromkeys(urls))
+    return await handler(
+        urls=urls,
+        depth=depth,
+        max_pages=max_pages,
+        format=format,
+        stealth=stealth,
+    )
 
-        case _:
-            return (
-                f"Error: Unknown action '{action}'. Valid actions: extract, crawl, map"
-            )
+
+# ---------------------------------------------------------------------------
+# media tool: list, download, analyze
+# ---------------------------------------------------------------------------
+
+
+async def _media_list(url, media_type, max_items, **_) -> str:
+    if not url:
+        return "Error: url is required for list action"
+    return await _with_timeout(
+        list_media(url=url, media_type=media_type, max_items=max_items),
+        "media.list",
+    )
+
+
+async def _media_download(media_urls, output_dir, **_) -> str:
+    if not media_urls:
+        return "Error: media_urls is required for download action"
+
+    return await _with_timeout(
+        _crawler.download_media(
+            media_urls=media_urls,
+            output_dir=output_dir or settings.download_dir,
+        ),
+        "media.download",
+    )
+
+
+async def _media_analyze(url, prompt, **_) -> str:
+    if not url:
+        return "Error: url (local path) is required for analyze action"
+
+    from wet_mcp.llm import analyze_media
+
+    return await _with_timeout(
+        analyze_media(media_path=url, prompt=prompt),
+        "media.analyze",
+    )
+
+
+_MEDIA_ACTIONS = {
+    "list": _media_list,
+    "download": _media_download,
+    "analyze": _media_analyze,
+}
 
 
 @mcp.tool(
@@ -671,41 +1164,25 @@ async def media(
 
     Use `help` tool for full documentation.
     """
-    from wet_mcp.sources.crawler import download_media
-
-    match action:
-        case "list":
-            if not url:
-                return "Error: url is required for list action"
-            return await _with_timeout(
-                list_media(url=url, media_type=media_type, max_items=max_items),
-                "media.list",
-            )
-
-        case "download":
-            if not media_urls:
-                return "Error: media_urls is required for download action"
-            return await _with_timeout(
-                download_media(
-                    media_urls=media_urls,
-                    output_dir=output_dir or settings.download_dir,
-                ),
-                "media.download",
-            )
-
-        case "analyze":
-            if not url:
-                return "Error: url (local path) is required for analyze action"
-
-            from wet_mcp.llm import analyze_media
+    handler = _MEDIA_ACTIONS.get(action)
+    if handler is None:
+        return (
+            f"Error: Unknown action '{action}'. Valid actions: list, download, analyze"
+        )
+    return await handler(
+        url=url,
+        media_type=media_type,
+        media_urls=media_urls,
+        output_dir=output_dir,
+        max_items=max_items,
+        prompt=prompt,
+    )
 
-            return await _with_timeout(
-                analyze_media(media_path=url, prompt=prompt),
-                "media.analyze",
-            )
 
-        case _:
-            return f"Error: Unknown action '{action}'. Valid actions: list, download, analyze"
+@functools.lru_cache(maxsize=16)
+def _load_doc(tool_name: str) -> str:
+    """Read a tool's markdown doc; the packaged docs never change at runtime."""
+    return files("wet_mcp.docs").joinpath(f"{tool_name}.md").read_text(encoding="utf-8")
 
 
 @mcp.tool(
@@ -721,14 +1198,50 @@ async def help(tool_name: str = "search") -> str:
     Valid tool names: search, extract, media, config, help.
     """
     try:
-        doc_file = files("wet_mcp.docs").joinpath(f"{tool_name}.md")
-        return doc_file.read_text()
+        return _load_doc(tool_name)
     except FileNotFoundError:
         return f"Error: No documentation found for tool '{tool_name}'"
     except Exception as e:
         return f"Error loading documentation: {e}"
 
 
+# Encoders for tool responses, built once: json.dumps() constructs a new
+# JSONEncoder whenever it is given non-default options.
+_STATUS_ENCODER = json.JSONEncoder(indent=2, default=str)
+_CONFIG_ENCODER = json.JSONEncoder(default=str)
+_RESULT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
+
+def _set_log_level(value: str) -> None:
+    settings.log_level = value.upper()
+    logger.remove()
+    logger.add(sys.stderr, level=settings.log_level)
+
+
+def _setter(key: str, coerce=str):
+    """Build a ``config set`` handler assigning ``coerce(value)`` to *key*."""
+    return lambda value: setattr(settings, key, coerce(value))
+
+
+def _as_bool(value: str) -> bool:
+    return value.lower() in _TRUTHY
+
+
+# Runtime-settable keys -> handler, built once; also the source of truth
+# for the ``valid_keys`` list in error responses.
+_CONFIG_SETTERS = {
+    "log_level": _set_log_level,
+    "tool_timeout": _setter("tool_timeout", int),
+    "wet_cache": _setter("wet_cache", _as_bool),
+    "sync_enabled": _setter("sync_enabled", _as_bool),
+    "sync_remote": _setter("sync_remote"),
+    "sync_folder": _setter("sync_folder"),
+    "sync_interval": _setter("sync_interval", int),
+}
+
+
 @mcp.tool(
     description=(
         "Server config and management. Actions: "
@@ -753,16 +1266,13 @@ async def config(
     Actions:
     - status: Show current config and status
     - set: Update runtime setting (key + value required)
-    - cache_clear: Clear web cache
+    - cache_clear: Clear web cache and cached docs embeddings
     - docs_reindex: Force re-index a library (key = library name)
     """
     match action:
         case "status":
-            from wet_mcp.embedder import get_backend
-            from wet_mcp.reranker import get_reranker
-
-            embed_backend = get_backend()
-            reranker = get_reranker()
+            embed_backend = _embedder.get_backend()
+            reranker = _reranker.get_reranker()
 
             status = {
                 "database": {
@@ -799,59 +1309,31 @@ async def config(
                     "tool_timeout": settings.tool_timeout,
                 },
             }
-            return json.dumps(status, indent=2, default=str)
+            return _STATUS_ENCODER.encode(status)
 
         case "set":
             if not key or value is None:
                 return json.dumps({"error": "key and value are required for set"})
-            valid_keys = {
-                "log_level",
-                "tool_timeout",
-                "wet_cache",
-                "sync_enabled",
-                "sync_remote",
-                "sync_folder",
-                "sync_interval",
-            }
-            if key not in valid_keys:
+            setter = _CONFIG_SETTERS.get(key)
+            if setter is None:
                 return json.dumps(
                     {
                         "error": f"Invalid key: {key}",
-                        "valid_keys": sorted(valid_keys),
+                        "valid_keys": sorted(_CONFIG_SETTERS),
                     }
                 )
-            if key == "log_level":
-                settings.log_level = value.upper()
-                logger.remove()
-                logger.add(sys.stderr, level=settings.log_level)
-            elif key == "tool_timeout":
-                settings.tool_timeout = int(value)
-            elif key == "wet_cache":
-                settings.wet_cache = value.lower() in (
-                    "true",
-                    "1",
-                    "yes",
-                )
-            elif key == "sync_enabled":
-                settings.sync_enabled = value.lower() in (
-                    "true",
-                    "1",
-                    "yes",
-                )
-            elif key == "sync_interval":
-                settings.sync_interval = int(value)
-            else:
-                setattr(settings, key, value)
-            return json.dumps(
+            setter(value)
+            return _CONFIG_ENCODER.encode(
                 {
                     "status": "updated",
                     "key": key,
                     "value": getattr(settings, key),
-                },
-                default=str,
+                }
             )
 
         case "cache_clear":
+            if _docs_db:
+                _docs_db.clear_embedding_cache()
             if _web_cache:
                 _web_cache.clear()
                 return json.dumps({"status": "cache cleared"})
@@ -867,6 +1349,9 @@ async def config(
                 ver = _docs_db.get_best_version(lib["id"])
                 if ver:
                     _docs_db.clear_version_chunks(ver["id"])
+                # Cached answers were ranked against the cleared index
+                if _web_cache:
+                    _web_cache.clear("docs")
                 return json.dumps(
                     {
                         "status": "cleared",
@@ -895,6 +1380,18 @@ async def config(
 # ---------------------------------------------------------------------------
 
 
+# URL marker -> source_type for research results, matched in one regex scan
+_ACADEMIC_SOURCES = {
+    "arxiv.org": "arxiv",
+    "scholar.google": "google_scholar",
+    "semanticscholar.org": "semantic_scholar",
+    "pubmed": "pubmed",
+    "nih.gov": "pubmed",
+    "doi.org": "doi",
+}
+_ACADEMIC_SOURCE_RE = re.compile("|".join(map(re.escape, _ACADEMIC_SOURCES)))
+
+
 async def _do_research(query: str, max_results: int = 10) -> str:
     """Academic/scientific search using SearXNG science engines."""
     try:
@@ -904,48 +1401,30 @@ async def _do_research(query: str, max_results: int = 10) -> str:
     except (SystemExit, Exception) as exc:
         return f"Error: SearXNG startup failed: {exc}"
 
-    result_str = await searxng_search(
+    # Results arrive as a dict, so rerank and enrichment share ``data`` and
+    # it is serialized exactly once
+    data = await searxng_search_results(
         searxng_url=searxng_url,
         query=query,
         categories="science",
         max_results=max_results * 3,
     )
     try:
-        data = json.loads(result_str)
         if "results" in data and data["results"]:
             reranked = await _rerank_results(query, data["results"], top_n=max_results)
             data["results"] = [r for r in reranked if r.get("score", 1.0) > 0.3]
             data["total"] = len(data["results"])
-            result_str = json.dumps(data, ensure_ascii=False, indent=2)
     except Exception as e:
         logger.error(f"Reranking failed: {e}")
 
-    # Re-format results for academic context
-    try:
-        data = json.loads(result_str)
-        results = data.get("results", [])
-
-        # Enrich with academic metadata hints
-        for r in results:
-            url = r.get("url", "")
-            if "arxiv.org" in url:
-                r["source_type"] = "arxiv"
-            elif "scholar.google" in url:
-                r["source_type"] = "google_scholar"
-            elif "semanticscholar.org" in url:
-                r["source_type"] = "semantic_scholar"
-            elif "pubmed" in url or "nih.gov" in url:
-                r["source_type"] = "pubmed"
-            elif "doi.org" in url:
-                r["source_type"] = "doi"
-            else:
-                r["source_type"] = "academic"
-
-        data["query"] = query
-        data["search_type"] = "academic"
-        return json.dumps(data, ensure_ascii=False, indent=2)
-    except json.JSONDecodeError:
-        return result_str
+    # Enrich with academic metadata hints
+    for r in data.get("results", []):
+        m = _ACADEMIC_SOURCE_RE.search(r.get("url", ""))
+        r["source_type"] = _ACADEMIC_SOURCES[m.group(0)] if m else "academic"
+
+    data["query"] = query
+    data["search_type"] = "academic"
+    return _RESULT_ENCODER.encode(data)
 
 
 # ---------------------------------------------------------------------------
@@ -956,6 +1435,70 @@ async def _do_research(query: str, max_results: int = 10) -> str:
 # If fewer are produced, the tier is skipped in favor of crawling.
 _MIN_GH_CHUNKS = 20
 
+# Head start (seconds) given to llms.txt before the GitHub raw tier is
+# launched alongside it. The crawl tier waits for GitHub raw to fall short.
+_LLMS_HEAD_START = 1.5
+
+
+def _chunk_page(page: dict) -> list[dict]:
+    """Chunk one fetched markdown page, stamping its title onto chunks."""
+    page_chunks = _docs.chunk_markdown(
+        content=page["content"],
+        url=page.get("url", ""),
+    )
+    if page.get("title"):
+        for chunk in page_chunks:
+            if not chunk.get("title"):
+                chunk["title"] = page["title"]
+    return page_chunks
+
+
+async def _chunk_pages(pages: list[dict]) -> list[dict]:
+    """Chunk pages on the worker pool, keeping page order.
+
+    Markdown splitting is CPU work; running it off the event loop keeps
+    other tool calls (and the tiers still fetching) responsive.
+    """
+    per_page = await asyncio.gather(*(_to_thread(_chunk_page, p) for p in pages))
+    return [chunk for page_chunks in per_page for chunk in page_chunks]
+
+
+async def _tier_llms(docs_url: str) -> tuple[list[dict], int]:
+    """Tier 0: llms.txt / llms-full.txt."""
+    llms_content = await _docs.try_llms_txt(docs_url)
+    if not llms_content:
+        return [], 0
+    return _docs.chunk_llms_txt(llms_content, base_url=docs_url), 1
+
+
+async def _tier_github(gh_target: str, library_hint: str) -> tuple[list[dict], int]:
+    """Tier 1: GitHub raw markdown."""
+    gh_pages = await _docs._try_github_raw_docs(
+        gh_target, max_files=50, library_hint=library_hint
+    )
+    if not gh_pages:
+        return [], 0
+    return await _chunk_pages(gh_pages), len(gh_pages)
+
+
+async def _tier_crawl(docs_url: str, query: str) -> tuple[list[dict], int]:
+    """Tier 2: Crawl4AI page crawling."""
+    pages = await _docs.fetch_docs_pages(
+        docs_url=docs_url,
+        query=query,
+        max_pages=50,
+    )
+    return await _chunk_pages(pages), len(pages)
+
+
+async def _run_tier(name: str, coro) -> tuple[list[dict], int]:
+    """Await a docs tier; a failed tier counts as empty, not fatal."""
+    try:
+        return await coro
+    except Exception as e:
+        logger.warning(f"Docs tier '{name}' failed: {e}")
+        return [], 0
+
 
 async def _fetch_and_chunk_docs(
     docs_url: str,
@@ -965,92 +1508,81 @@ async def _fetch_and_chunk_docs(
 ) -> tuple[list[dict], int]:
     """Fetch library documentation and split into searchable chunks.
 
-    Tries content sources in priority order:
+    Content sources, in priority order:
     1. llms.txt / llms-full.txt (fastest, AI-optimized)
     2. GitHub raw markdown (clean, no JS rendering needed)
     3. Crawl4AI page crawling (rendered HTML -> markdown)
 
+    llms.txt gets a short head start; if it has not produced enough
+    chunks by then, GitHub raw runs concurrently with it. The browser
+    crawl is only started once GitHub raw has settled below its gate,
+    so a library GitHub can serve never pays for one. The
+    highest-priority tier that passes its quality gate wins and the
+    rest are cancelled.
+
     Returns:
         Tuple of (chunks, page_count).
     """
-    from wet_mcp.sources.docs import (
-        _try_github_raw_docs,
-        chunk_llms_txt,
-        chunk_markdown,
-        fetch_docs_pages,
-        try_llms_txt,
-    )
-
-    # Tier 0: Try llms.txt (fastest, best quality)
-    llms_content = await try_llms_txt(docs_url)
-    if llms_content:
-        chunks = chunk_llms_txt(llms_content, base_url=docs_url)
-        # Quality gate: skip llms.txt if it's too small (likely a TOC/meta file)
-        if len(chunks) >= _MIN_GH_CHUNKS:
-            logger.info(f"Indexed {len(chunks)} chunks from llms.txt")
-            return chunks, 1
-        else:
-            logger.info(
-                f"llms.txt produced only {len(chunks)} chunks "
-                f"(min {_MIN_GH_CHUNKS}), falling through"
-            )
-
-    # Tier 1: Try GitHub raw markdown (clean content, no JS rendering)
     gh_target = repo_url or docs_url
-    gh_pages = await _try_github_raw_docs(
-        gh_target, max_files=50, library_hint=library_hint
-    )
-    gh_chunks: list[dict] = []
-    gh_page_count = 0
-    if gh_pages:
-        for page in gh_pages:
-            page_chunks = chunk_markdown(
-                content=page["content"],
-                url=page.get("url", ""),
-            )
-            for chunk in page_chunks:
-                if not chunk.get("title") and page.get("title"):
-                    chunk["title"] = page["title"]
-            gh_chunks.extend(page_chunks)
-        gh_page_count = len(gh_pages)
-
-        # Quality gate: if GitHub raw produced too few meaningful chunks,
-        # fall through to Tier 2 (crawl docs site). This handles repos
-        # where docs use template macros (Polars), RST, or other formats
-        # that produce poor raw markdown.
-        if len(gh_chunks) >= _MIN_GH_CHUNKS:
-            logger.info(
-                f"Indexed {len(gh_chunks)} chunks from {len(gh_pages)} "
-                "GitHub raw markdown files"
+    # (name, minimum chunks, preempts) per tier, in priority order. Gated
+    # tiers win as soon as they pass; the ungated crawl tier is only used
+    # once every tier above it has settled below its gate.
+    gates = [
+        ("llms.txt", _MIN_GH_CHUNKS, True),
+        ("github", _MIN_GH_CHUNKS, True),
+        ("crawl", 1, False),
+    ]
+    tasks = [asyncio.create_task(_run_tier("llms.txt", _tier_llms(docs_url)))]
+    try:
+        await asyncio.wait(tasks, timeout=_LLMS_HEAD_START)
+        if not tasks[0].done() or len(tasks[0].result()[0]) < _MIN_GH_CHUNKS:
+            tasks.append(
+                asyncio.create_task(
+                    _run_tier("github", _tier_github(gh_target, library_hint))
+                )
             )
-            return gh_chunks, len(gh_pages)
-        else:
-            logger.info(
-                f"GitHub raw produced only {len(gh_chunks)} chunks "
-                f"(min {_MIN_GH_CHUNKS}), falling through to crawl"
+        while True:
+            if (
+                len(tasks) == 2
+                and tasks[1].done()
+                and len(tasks[1].result()[0]) < _MIN_GH_CHUNKS
+            ):
+                tasks.append(
+                    asyncio.create_task(
+                        _run_tier("crawl", _tier_crawl(docs_url, query))
+                    )
+                )
+            settled = True
+            for task, (name, min_chunks, preempts) in zip(tasks, gates, strict=False):
+                if not task.done():
+                    settled = False
+                    continue
+                chunks, page_count = task.result()
+                if len(chunks) >= min_chunks and (preempts or settled):
+                    logger.info(
+                        f"Indexed {len(chunks)} chunks from {page_count} "
+                        f"pages via {name}"
+                    )
+                    return chunks, page_count
+            if settled:
+                break
+            await asyncio.wait(
+                [t for t in tasks if not t.done()],
+                return_when=asyncio.FIRST_COMPLETED,
             )
-
-    # Tier 2: Crawl docs pages (rendered HTML -> markdown)
-    pages = await fetch_docs_pages(
-        docs_url=docs_url,
-        query=query,
-        max_pages=50,
-    )
-    chunks: list[dict] = []
-    for page in pages:
-        page_chunks = chunk_markdown(
-            content=page["content"],
-            url=page.get("url", ""),
-        )
-        for chunk in page_chunks:
-            if not chunk.get("title") and page.get("title"):
-                chunk["title"] = page["title"]
-        chunks.extend(page_chunks)
-
-    # If Tier 2 crawl produced no results (e.g. Cloudflare blocked) but
-    # Tier 1 GitHub raw had some content (below threshold), use it instead
-    # of returning nothing.  Some docs are better than no docs.
-    if not chunks and gh_chunks:
+    finally:
+        pending = [t for t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Crawl4AI may swallow cancellation: bound the cleanup wait
+            await asyncio.wait(pending, timeout=_CANCEL_GRACE_PERIOD)
+
+    # Every tier finished below its gate. If GitHub raw had some content
+    # (below threshold), use it instead of returning nothing.  Some docs
+    # are better than no docs.
+    gh_chunks, gh_page_count = tasks[1].result()
+    if gh_chunks:
         logger.info(
             f"Crawl produced 0 chunks, using {len(gh_chunks)} GitHub raw "
             f"chunks from {gh_page_count} files (below threshold but "
@@ -1062,19 +1594,17 @@ async def _fetch_and_chunk_docs(
     # When all tiers fail AND we have a GitHub repo, fetch just the
     # README.md.  This handles repos without a docs/ directory whose
     # docs site is also uncrawlable (Cloudflare, JS-rendered, etc.).
-    if not chunks:
-        from wet_mcp.sources.docs import _fetch_github_readme
-
-        readme_chunks = await _fetch_github_readme(repo_url or docs_url)
-        if readme_chunks:
-            logger.info(
-                f"All tiers failed, using {len(readme_chunks)} chunks "
-                "from GitHub README (last resort)"
-            )
-            return readme_chunks, 1
+    readme_chunks = await _docs._fetch_github_readme(gh_target)
+    if readme_chunks:
+        logger.info(
+            f"All tiers failed, using {len(readme_chunks)} chunks "
+            "from GitHub README (last resort)"
+        )
+        return readme_chunks, 1
 
-    logger.info(f"Indexed {len(chunks)} chunks from {len(pages)} pages")
-    return chunks, len(pages)
+    page_count = tasks[2].result()[1]
+    logger.info(f"Indexed 0 chunks from {page_count} pages")
+    return [], page_count
 
 
 # ---------------------------------------------------------------------------
@@ -1082,6 +1612,125 @@ async def _fetch_and_chunk_docs(
 # ---------------------------------------------------------------------------
 
 
+_NETLOC_RE = re.compile(r"^https?://([^/?#]*)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=512)
+def _netloc(url: str) -> str:
+    """Network location of *url*, memoized for repeat comparisons."""
+    m = _NETLOC_RE.match(url)
+    return m.group(1) if m else urlsplit(url).netloc
+
+
+@functools.lru_cache(maxsize=4096)
+def _lib_key(library: str, language: str | None) -> str:
+    """DocsDB library key: ``name:language`` when a language is given."""
+    return f"{library}:{language.lower()}" if language else library
+
+
+# A sparse primary fetch (few pages, < 100 chunks) triggers a SearXNG
+# search for an alternative docs site. Skip it when the chunks are already
+# well structured, or come from a curated docs site that is known to be
+# the right source.
+_FALLBACK_MIN_HEADINGS = 10
+_FALLBACK_MIN_MEDIAN_CHARS = 200
+
+
+@functools.cache
+def _trusted_docs_netlocs() -> frozenset[str]:
+    """Netlocs of the curated well-known docs sites, excluding GitHub."""
+    return frozenset(
+        netloc
+        for entry in _docs._WELL_KNOWN_DOCS.values()
+        if (netloc := urlsplit(entry["homepage"]).netloc) != "github.com"
+    )
+
+
+def _primary_docs_sufficient(docs_url: str, chunks: list[dict]) -> bool:
+    """Whether a sparse primary fetch is good enough to skip the fallback."""
+    if not chunks:
+        return False
+    if _netloc(docs_url) in _trusted_docs_netlocs():
+        return True
+    headings = {c.get("heading_path") for c in chunks if c.get("heading_path")}
+    if len(headings) < _FALLBACK_MIN_HEADINGS:
+        return False
+    lengths = sorted(len(c["content"]) for c in chunks)
+    return lengths[len(lengths) // 2] > _FALLBACK_MIN_MEDIAN_CHARS
+
+
+# Chunks embedded and stored per window during background indexing, and
+# how many windows may be embedding at once.
+_INDEX_WINDOW = 128
+_INDEX_WINDOW_CONCURRENCY = 4
+
+
+_EMBED_TEXT_MAX = 2000  # chars of chunk text sent to the embedder
+
+
+def _chunk_embed_text(chunk: dict) -> str:
+    """Text embedded for a chunk: title | heading path | content.
+
+    Content is capped before joining so oversized chunks never build a
+    full-length string only to slice it back down.
+    """
+    body = chunk["content"][:_EMBED_TEXT_MAX]
+    title = chunk.get("title") or ""
+    heading = chunk.get("heading_path") or ""
+    if heading == title:
+        heading = ""
+    if not title and not heading:
+        return body
+    prefix = f"{title} | {heading}" if title and heading else title or heading
+    return f"{prefix} | {body}"[:_EMBED_TEXT_MAX]
+
+
+async def _embed_and_store(
+    window: list[dict],
+    ver_id: str,
+    lib_id: str,
+    sem: asyncio.Semaphore,
+    deadline: float,
+    docs_db: DocsDB,
+    backend,
+    dims: int,
+) -> None:
+    """Embed one window of chunks and store it.
+
+    Windows that miss the shared ``deadline`` (or whose embedding fails)
+    are stored without vectors and stay searchable through FTS.
+    """
+    embeddings = None
+    if backend is not None:
+        async with sem:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining > 0:
+                try:
+                    embeddings = await asyncio.wait_for(
+                        _embed_batch_cached(
+                            [_chunk_embed_text(c) for c in window],
+                            docs_db,
+                            backend,
+                            dims,
+                        ),
+                        timeout=remaining,
+                    )
+                except TimeoutError:
+                    embeddings = None
+    docs_db.add_chunks(
+        version_id=ver_id,
+        library_id=lib_id,
+        chunks=window,
+        embeddings=embeddings,
+    )
+
+
+# In-flight background indexers by version id. Holding the task keeps it
+# from being garbage collected mid-run, and a repeat query for a library
+# that is still indexing joins it instead of re-fetching the whole site.
+_indexing_tasks: dict[str, asyncio.Task] = {}
+
+
 async def _background_index_and_search(
     library: str,
     lib_key: str,
@@ -1092,14 +1741,18 @@ async def _background_index_and_search(
     version: str | None,
     lib_id: str,
     ver_id: str,
+    docs_db: DocsDB,
+    backend,
+    dims: int,
 ):
-    """Background task to fetch, chunk, embed, and store docs."""
-    try:
-        from urllib.parse import urlparse
+    """Background task to fetch, chunk, embed, and store docs.
 
-        from wet_mcp.sources.docs import _normalize_docs_url
-
-        docs_url = _normalize_docs_url(docs_url)
+    ``docs_db``, ``backend`` and ``dims`` are the requesting call's
+    snapshot: every window is embedded in the same space even if the
+    backend is swapped while indexing runs.
+    """
+    try:
+        docs_url = _docs._normalize_docs_url(docs_url)
         logger.info(f"Background indexing started for '{library}' from {docs_url}...")
 
         try:
@@ -1119,7 +1772,11 @@ async def _background_index_and_search(
             all_chunks, page_count = [], 0
 
         # Fallback SearXNG
-        if page_count <= 2 and len(all_chunks) < 100:
+        if (
+            page_count <= 2
+            and len(all_chunks) < 100
+            and not _primary_docs_sufficient(docs_url, all_chunks)
+        ):
             fallback_query = (
                 f"{library} {language} documentation"
                 if language
@@ -1129,8 +1786,8 @@ async def _background_index_and_search(
                 searxng_url = await asyncio.wait_for(
                     ensure_searxng(), timeout=_SEARXNG_TIMEOUT
                 )
-                fallback_result = await asyncio.wait_for(
-                    searxng_search(
+                fallback_data = await asyncio.wait_for(
+                    searxng_search_results(
                         searxng_url=searxng_url,
                         query=fallback_query,
                         categories="general",
@@ -1138,16 +1795,11 @@ async def _background_index_and_search(
                     ),
                     timeout=15,
                 )
-                import json
-
-                fallback_data = json.loads(fallback_result)
                 for fr in fallback_data.get("results", []):
                     alt_url = fr.get("url", "")
                     if not alt_url or not alt_url.startswith("http"):
                         continue
-                    alt_parsed = urlparse(alt_url)
-                    orig_parsed = urlparse(docs_url)
-                    if alt_parsed.netloc == orig_parsed.netloc:
+                    if _netloc(alt_url) == _netloc(docs_url):
                         continue
                     try:
                         alt_chunks, alt_pages = await asyncio.wait_for(
@@ -1164,44 +1816,42 @@ async def _background_index_and_search(
             except Exception as e:
                 logger.debug(f"SearXNG fallback failed: {e}")
 
+        # Clear old chunks only now: the request returned before the fetch,
+        # and the previous index stays searchable while it runs.
+        docs_db.clear_version_chunks(ver_id)
+
         if not all_chunks:
             logger.error(
                 f"Background indexing failed: Could not extract content from {docs_url}"
             )
             return
 
-        # Generate embeddings
-        embeddings = None
-        if all_chunks:
-            from wet_mcp.embedder import get_backend
-
-            if get_backend() is not None:
-                embed_texts_list = []
-                for c in all_chunks:
-                    parts = []
-                    if c.get("title"):
-                        parts.append(c["title"])
-                    if c.get("heading_path") and c.get("heading_path") != c.get(
-                        "title"
-                    ):
-                        parts.append(c["heading_path"])
-                    parts.append(c["content"])
-                    embed_texts_list.append(" | ".join(parts)[:2000])
-                try:
-                    embeddings = await asyncio.wait_for(
-                        _embed_batch(embed_texts_list), timeout=_EMBED_TIMEOUT
-                    )
-                except TimeoutError:
-                    embeddings = None
-
-        # Store chunks
-        _docs_db.add_chunks(
-            version_id=ver_id,
-            library_id=lib_id,
-            chunks=all_chunks,
-            embeddings=embeddings,
+        # Embed and store in windows: the backend works on one window while
+        # earlier ones are written, and peak memory is bounded by the
+        # windows in flight rather than the whole corpus.
+        for i, chunk in enumerate(all_chunks):
+            chunk.setdefault("chunk_index", i)
+        sem = asyncio.Semaphore(_INDEX_WINDOW_CONCURRENCY)
+        deadline = asyncio.get_running_loop().time() + _EMBED_TIMEOUT
+        await asyncio.gather(
+            *(
+                _embed_and_store(
+                    all_chunks[start : start + _INDEX_WINDOW],
+                    ver_id,
+                    lib_id,
+                    sem,
+                    deadline,
+                    docs_db,
+                    backend,
+                    dims,
+                )
+                for start in range(0, len(all_chunks), _INDEX_WINDOW)
+            )
         )
-        _docs_db.mark_version_indexed(ver_id, page_count, len(all_chunks))
+        docs_db.mark_version_indexed(ver_id, page_count, len(all_chunks))
+        # Cached answers were ranked against the previous index.
+        if _web_cache:
+            _web_cache.clear("docs")
         logger.info(
             f"Background indexing complete for '{library}'. Pages: {page_count}, Chunks: {len(all_chunks)}"
         )
@@ -1218,66 +1868,71 @@ async def _do_docs_search(
     limit: int = 10,
 ) -> str:
     """Search library documentation. Auto-discovers and indexes if needed."""
-    if not _docs_db:
+    docs_db = _docs_db  # one snapshot for the whole request
+    if not docs_db:
         return "Error: Docs database not initialized"
 
     # Build library identity — include language for DB disambiguation
     # e.g., "redis" (no lang) vs "redis:python" vs "redis:javascript"
-    lib_key = f"{library}:{language.lower()}" if language else library
-
-    from wet_mcp.sources.docs import DISCOVERY_VERSION
+    lib_key = _lib_key(library, language)
 
     # Step 1: Check if library is already indexed
-    lib = _docs_db.get_library(lib_key)
+    lib = docs_db.get_library(lib_key)
 
     if lib:
         # Invalidate cache if discovery scoring has been updated
         cached_version = lib.get("discovery_version", 0)
-        if cached_version < DISCOVERY_VERSION:
+        if cached_version < _docs.DISCOVERY_VERSION:
             logger.info(
                 f"Library '{lib_key}' cached with discovery v{cached_version} "
-                f"(current v{DISCOVERY_VERSION}), forcing re-index"
+                f"(current v{_docs.DISCOVERY_VERSION}), forcing re-index"
             )
             lib = None  # Force re-discovery below
 
     if lib:
         # Check if we have indexed chunks
-        ver = _docs_db.get_best_version(lib["id"], version)
+        ver = docs_db.get_best_version(lib["id"], version)
         if ver and ver.get("chunk_count", 0) > 0:
-            # Search existing index — retrieve extra candidates for reranking
-            query_embedding = await _embed(query, is_query=True)
+            # Search existing index — retrieve extra candidates for reranking.
+            # The query embedding is computed while the FTS stage runs.
+            embed_task = asyncio.create_task(_embed(query, is_query=True))
+            await asyncio.sleep(0)  # let the embed request join a batch
             retrieve_limit = limit * _RERANK_CANDIDATE_MULTIPLIER
+            fts = docs_db.search_fts(
+                query=query,
+                library_name=lib_key,
+                version=version,
+                limit=retrieve_limit,
+            )
+            query_embedding = await embed_task
 
-            results = _docs_db.search(
+            results = docs_db.search(
                 query=query,
                 library_name=lib_key,
                 version=version,
                 limit=retrieve_limit,
                 query_embedding=query_embedding,
+                fts=fts,
             )
 
             if results:
                 # Rerank if available, otherwise truncate to limit
                 results = await _rerank_results(query, results, limit)
-                return json.dumps(
-                    {
-                        "library": library,
-                        "version": ver.get("version", "latest"),
-                        "results": results,
-                        "total": len(results),
-                        "source": "cached_index",
-                    },
-                    ensure_ascii=False,
-                    indent=2,
+                return _IndexedDocsResult(
+                    _RESULT_ENCODER.encode(
+                        {
+                            "library": library,
+                            "version": ver.get("version", "latest"),
+                            "results": results,
+                            "total": len(results),
+                            "source": "cached_index",
+                        }
+                    )
                 )
 
     # Step 2: Auto-discover and index
     logger.info(f"Library '{lib_key}' not indexed, discovering docs...")
 
-    from wet_mcp.sources.docs import (
-        discover_library,
-    )
-
     # Discover library metadata from registries (with sub-timeout)
     docs_url = ""
     repo_url = ""
@@ -1285,7 +1940,7 @@ async def _do_docs_search(
     description = ""
     try:
         discovery = await asyncio.wait_for(
-            discover_library(library, language=language),
+            _docs.discover_library(library, language=language),
             timeout=_DISCOVERY_TIMEOUT,
         )
     except TimeoutError:
@@ -1312,8 +1967,8 @@ async def _do_docs_search(
             searxng_url = await asyncio.wait_for(
                 ensure_searxng(), timeout=_SEARXNG_TIMEOUT
             )
-            search_result = await asyncio.wait_for(
-                searxng_search(
+            search_data = await asyncio.wait_for(
+                searxng_search_results(
                     searxng_url=searxng_url,
                     query=search_query,
                     categories="general",
@@ -1321,14 +1976,11 @@ async def _do_docs_search(
                 ),
                 timeout=15,
             )
-            search_data = json.loads(search_result)
             top_results = search_data.get("results", [])
             if top_results:
                 docs_url = top_results[0].get("url", "")
         except TimeoutError:
             logger.warning("SearXNG discovery fallback timed out")
-        except json.JSONDecodeError:
-            pass
 
     if not docs_url:
         # When no docs URL found but we have a GitHub repo URL,
@@ -1347,47 +1999,52 @@ async def _do_docs_search(
             )
 
     # Create/update library record
-    lib_id = _docs_db.upsert_library(
+    lib_id = docs_db.upsert_library(
         name=lib_key,
         docs_url=docs_url,
         registry=registry,
         description=description,
     )
-    ver_id = _docs_db.upsert_version(
+    ver_id = docs_db.upsert_version(
         library_id=lib_id,
         version=version or "latest",
         docs_url=docs_url,
     )
 
-    # Clear old chunks for re-indexing
-    _docs_db.clear_version_chunks(ver_id)
-
-    # Step 3: Launch background indexer
-    asyncio.create_task(
-        _background_index_and_search(
-            library=library,
-            lib_key=lib_key,
-            language=language,
-            docs_url=docs_url,
-            repo_url=repo_url,
-            query=query,
-            version=version,
-            lib_id=lib_id,
-            ver_id=ver_id,
+    # Step 3: Launch background indexer (unless one is already running)
+    if ver_id not in _indexing_tasks:
+        task = asyncio.create_task(
+            _background_index_and_search(
+                library=library,
+                lib_key=lib_key,
+                language=language,
+                docs_url=docs_url,
+                repo_url=repo_url,
+                query=query,
+                version=version,
+                lib_id=lib_id,
+                ver_id=ver_id,
+                docs_db=docs_db,
+                backend=_embedder.get_backend(),
+                dims=_embedding_dims,
+            )
         )
-    )
+        _indexing_tasks[ver_id] = task
+        task.add_done_callback(lambda _: _indexing_tasks.pop(ver_id, None))
+    else:
+        logger.info(f"Indexing already in progress for '{lib_key}'")
 
     # Do immediate fallback web search
     fallback_search_query = (
-        f"site:{urlparse(docs_url).netloc} {query}"
+        f"site:{_netloc(docs_url)} {query}"
         if docs_url
         else f"{library} {language} {query}"
     )
     fallback_data = {"results": []}
     try:
         searxng_url = await asyncio.wait_for(ensure_searxng(), timeout=_SEARXNG_TIMEOUT)
-        fallback_result = await asyncio.wait_for(
-            searxng_search(
+        fallback_data = await asyncio.wait_for(
+            searxng_search_results(
                 searxng_url=searxng_url,
                 query=fallback_search_query,
                 categories="general",
@@ -1395,7 +2052,6 @@ async def _do_docs_search(
             ),
             timeout=15,
         )
-        fallback_data = json.loads(fallback_result)
         if "results" in fallback_data and fallback_data["results"]:
             fallback_data["results"] = await _rerank_results(
                 query, fallback_data["results"], top_n=limit
@@ -1403,16 +2059,14 @@ async def _do_docs_search(
     except Exception as e:
         logger.debug(f"Immediate fallback search failed: {e}")
 
-    return json.dumps(
+    return _RESULT_ENCODER.encode(
         {
             "status": "indexing_in_progress",
             "message": f"Library '{library}' is currently being downloaded and indexed in the background (this may take 3-5 minutes). In the meantime, here are temporary web search results.",
             "temporary_results": fallback_data.get("results", []),
             "library": library,
             "docs_url": docs_url,
-        },
-        ensure_ascii=False,
-        indent=2,
+        }
     )
 
 
@@ -1444,8 +2098,20 @@ def library_docs(library: str, question: str) -> str:
 
 
 def main() -> None:
-    """Entry point for the MCP server."""
-    mcp.run()
+    """Entry point for the MCP server.
+
+    Serves stdio like ``mcp.run()``, on uvloop when the ``uvloop`` extra
+    is installed (not available on Windows), otherwise on the default
+    asyncio event loop.
+    """
+    backend_options = {}
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        backend_options["loop_factory"] = uvloop.new_event_loop
+    anyio.run(mcp.run_stdio_async, backend_options=backend_options)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,11 @@ This module handles automatic first-run setup:
 Setup runs automatically on first server start.
 """
 
+import json
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from loguru import logger
@@ -91,13 +94,13 @@ def patch_searxng_windows() -> None:
             return
 
         # Patch: wrap `import pwd` in try/except
-        content = content.replace(
+        patched = content.replace(
             "import pwd\n",
             "try:\n    import pwd\nexcept ImportError:\n    pwd = None\n",
         )
 
         # Patch: guard pwd.getpwuid usage in error handler
-        content = content.replace(
+        patched = patched.replace(
             "        _pw = pwd.getpwuid(os.getuid())\n"
             '        logger.exception("[%s (%s)] can\'t connect valkey DB ...", '
             "_pw.pw_name, _pw.pw_uid)",
@@ -109,7 +112,11 @@ def patch_searxng_windows() -> None:
             '            logger.exception("can\'t connect valkey DB ...")',
         )
 
-        valkeydb_path.write_text(content, encoding="utf-8")
+        # Neither pattern matched (upstream changed the file): leave it alone
+        if patched == content:
+            return
+
+        valkeydb_path.write_text(patched, encoding="utf-8")
         logger.debug(f"Patched SearXNG valkeydb.py for Windows: {valkeydb_path}")
     except Exception as e:
         logger.warning(f"Failed to patch SearXNG for Windows: {e}")
@@ -145,13 +152,11 @@ def _install_searxng() -> bool:
     Returns:
         True if installation succeeded or already installed.
     """
-    try:
-        import searx  # noqa: F401
-
+    # Locate the package without importing it: searx/__init__ loads its
+    # settings and logging, which a presence check does not need.
+    if _find_searx_package_dir() is not None:
         logger.debug("SearXNG already installed")
         return True
-    except ImportError:
-        pass
 
     logger.info("Installing SearXNG from GitHub...")
     try:
@@ -206,6 +211,81 @@ def _install_searxng() -> bool:
         return False
 
 
+def _playwright_browsers_dir() -> Path:
+    """Directory Playwright downloads browsers into (its default per OS)."""
+    custom = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if custom and custom != "0":
+        return Path(custom)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "ms-playwright"
+
+
+def _chromium_installed() -> bool:
+    """Check whether the installed Playwright's Chromium builds are present.
+
+    Reads the browser revisions pinned by the installed ``playwright``
+    package and looks for their ``INSTALLATION_COMPLETE`` markers, so a
+    browser left behind by a different Playwright version does not count.
+    """
+    try:
+        import importlib.util
+
+        spec = importlib.util.find_spec("playwright")
+        if not spec or not spec.submodule_search_locations:
+            return False
+        package = Path(spec.submodule_search_locations[0]) / "driver" / "package"
+        browsers = json.loads((package / "browsers.json").read_text(encoding="utf-8"))[
+            "browsers"
+        ]
+    except Exception:
+        return False
+
+    if os.environ.get("PLAYWRIGHT_BROWSERS_PATH") == "0":
+        root = package / ".local-browsers"
+    else:
+        root = _playwright_browsers_dir()
+    wanted = [
+        b for b in browsers if b["name"] in ("chromium", "chromium-headless-shell")
+    ]
+    return bool(wanted) and all(
+        (
+            root
+            / f"{b['name'].replace('-', '_')}-{b['revision']}"
+            / "INSTALLATION_COMPLETE"
+        ).exists()
+        for b in wanted
+    )
+
+
+def _install_playwright_chromium() -> None:
+    """Download Playwright's Chromium and its system deps.
+
+    Skipped when this Playwright's Chromium is already downloaded, e.g. by
+    another venv.
+    """
+    if _chromium_installed():
+        logger.info("Playwright chromium already installed, skipping download")
+        return
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "playwright",
+            "install",
+            "chromium",
+            "--with-deps",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
 def _setup_crawl4ai() -> bool:
     """Run crawl4ai post-install setup.
 
@@ -223,28 +303,23 @@ def _setup_crawl4ai() -> bool:
     """
     logger.info("Running crawl4ai setup (browsers + system deps)...")
     try:
-        import subprocess
-        import sys
-
-        # 1. Setup home directory and run migration safely in a subprocess
-        subprocess.run(
-            [
-                sys.executable,
-                "-c",
-                "from crawl4ai.install import setup_home_directory, run_migration; setup_home_directory(); run_migration()",
-            ],
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-
-        # 2. Run playwright install safely
-        subprocess.run(
-            [sys.executable, "-m", "playwright", "install", "chromium", "--with-deps"],
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        # The browser download is network-bound and touches no Python
+        # packages, so it overlaps the home-directory setup and migration.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="wet-setup") as pool:
+            browsers = pool.submit(_install_playwright_chromium)
+
+            # Setup home directory and run migration safely in a subprocess
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "from crawl4ai.install import setup_home_directory, run_migration; setup_home_directory(); run_migration()",
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            browsers.result()
 
         logger.info("crawl4ai setup completed successfully")
         return True
@@ -264,6 +339,11 @@ def run_auto_setup() -> bool:
     1. SearXNG (metasearch engine, from GitHub)
     2. Playwright chromium + system deps (for Crawl4AI)
 
+    SearXNG is pip-installed first: the crawl4ai step starts subprocesses
+    that import from the same site-packages, so it must not run while
+    pip is writing there. Within the crawl4ai step the browser download
+    overlaps the rest of its setup.
+
     Returns:
         True if setup succeeded or was already done, False on failure.
     """
@@ -285,7 +365,7 @@ def run_auto_setup() -> bool:
         logger.warning("SearXNG not installed, search will use external URL")
         # Don't fail setup entirely - extract/crawl still works
 
-    # Step 3: Run crawl4ai setup (Playwright + system deps + patchright)
+    # Step 3: crawl4ai setup (Playwright + system deps), once pip is done
     if not _setup_crawl4ai():
         success = False
 
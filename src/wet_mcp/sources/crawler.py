@@ -21,7 +21,11 @@ from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from loguru import logger
 
 from wet_mcp.config import settings
-from wet_mcp.security import is_safe_url
+from wet_mcp.security import is_safe_url_async
+
+# Tool results are encoded with one prebuilt encoder: json.dumps() builds a
+# new JSONEncoder per call whenever it is given non-default options.
+_RESULT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
 
 # ---------------------------------------------------------------------------
 # Browser pool (singleton)
@@ -88,6 +92,17 @@ def _cleanup_browser_data_dir() -> None:
         logger.debug(f"Error cleaning browser data dir: {exc}")
 
 
+async def _check_urls(urls: list[str]) -> dict[str, bool]:
+    """SSRF-check several URLs concurrently.
+
+    Duplicate URLs are checked once, and DNS lookups for a shared host
+    collapse onto a single in-flight resolution.
+    """
+    unique = list(dict.fromkeys(urls))
+    verdicts = await asyncio.gather(*(is_safe_url_async(u) for u in unique))
+    return dict(zip(unique, verdicts, strict=True))
+
+
 async def _get_crawler(stealth: bool = False) -> AsyncWebCrawler:
     """Return a shared AsyncWebCrawler, creating one if necessary.
 
@@ -198,9 +213,12 @@ async def extract(
         run_config_kwargs["page_timeout"] = page_timeout
     run_config = CrawlerRunConfig(**run_config_kwargs)
 
+    # Validate up front so DNS lookups overlap and never hold a browser slot
+    safe_urls = await _check_urls(urls)
+
     async def process_url(url: str):
         async with sem:
-            if not is_safe_url(url):
+            if not safe_urls[url]:
                 logger.warning(f"Skipping unsafe URL: {url}")
                 return {"url": url, "error": "Security Alert: Unsafe URL blocked"}
 
@@ -240,7 +258,7 @@ async def extract(
     results = await asyncio.gather(*tasks)
 
     logger.info(f"Extracted {len(results)} pages")
-    return json.dumps(results, ensure_ascii=False, indent=2)
+    return _RESULT_ENCODER.encode(results)
 
 
 async def crawl(
@@ -269,9 +287,10 @@ async def crawl(
 
     crawler = await _get_crawler(stealth)
     sem = _get_semaphore()
+    safe_urls = await _check_urls(urls)
 
     for root_url in urls:
-        if not is_safe_url(root_url):
+        if not safe_urls[root_url]:
             logger.warning(f"Skipping unsafe URL: {root_url}")
             continue
 
@@ -327,7 +346,7 @@ async def crawl(
                     logger.error(f"Error crawling {url}: {e}")
 
     logger.info(f"Crawled {len(all_results)} pages")
-    return json.dumps(all_results, ensure_ascii=False, indent=2)
+    return _RESULT_ENCODER.encode(all_results)
 
 
 async def sitemap(
@@ -352,9 +371,10 @@ async def sitemap(
 
     crawler = await _get_crawler(stealth=False)
     sem = _get_semaphore()
+    safe_urls = await _check_urls(urls)
 
     for root_url in urls:
-        if not is_safe_url(root_url):
+        if not safe_urls[root_url]:
             logger.warning(f"Skipping unsafe URL: {root_url}")
             continue
 
@@ -395,7 +415,7 @@ async def sitemap(
         all_urls.extend(site_urls)
 
     logger.info(f"Mapped {len(all_urls)} URLs")
-    return json.dumps(all_urls, ensure_ascii=False, indent=2)
+    return _RESULT_ENCODER.encode(all_urls)
 
 
 async def list_media(
@@ -415,7 +435,7 @@ async def list_media(
     """
     logger.info(f"Listing media from: {url}")
 
-    if not is_safe_url(url):
+    if not await is_safe_url_async(url):
         return json.dumps({"error": "Security Alert: Unsafe URL blocked"})
 
     crawler = await _get_crawler(stealth=False)
@@ -443,7 +463,7 @@ async def list_media(
             output["audio"] = media.get("audios", [])[:max_items]
 
         logger.info(f"Found media: {sum(len(v) for v in output.values())} items")
-        return json.dumps(output, ensure_ascii=False, indent=2)
+        return _RESULT_ENCODER.encode(output)
 
 
 async def download_media(
@@ -491,7 +511,7 @@ async def download_media(
                 response = None
 
                 while redirect_count < max_redirects:
-                    if not is_safe_url(target_url):
+                    if not await is_safe_url_async(target_url):
                         return {
                             "url": url,
                             "error": "Security Alert: Unsafe URL blocked",
@@ -548,4 +568,4 @@ async def download_media(
         results = await asyncio.gather(*tasks)
 
     logger.info(f"Downloaded {len([r for r in results if 'path' in r])} files")
-    return json.dumps(results, ensure_ascii=False, indent=2)
+    return _RESULT_ENCODER.encode(results)
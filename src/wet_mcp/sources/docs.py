@@ -14,9 +14,11 @@ Content fetching:
 """
 
 import asyncio
+import functools
 import json
 import os
 import re
+import time
 import zlib
 from typing import Any
 from urllib.parse import urljoin, urlparse
@@ -1219,7 +1221,38 @@ _WELL_KNOWN_DOCS: dict[str, dict[str, str]] = {
 }
 
 
+# Discovery results are memoized per (version, name, language) so repeated
+# searches for the same library -- including ones that just failed -- skip
+# the registry fan-out. Misses expire sooner so transient outages recover.
+_DISCOVERY_TTL = 3600.0
+_DISCOVERY_NEGATIVE_TTL = 120.0
+_DISCOVERY_CACHE_SIZE = 1024
+_discovery_cache: dict[tuple[int, str, str | None], tuple[float, dict | None]] = {}
+
+
 async def discover_library(name: str, language: str | None = None) -> dict | None:
+    """Discover library metadata, memoized with a TTL.
+
+    See ``_discover_library`` for the discovery logic. The key includes
+    ``DISCOVERY_VERSION`` so a scoring change never serves stale results.
+    """
+    key = (DISCOVERY_VERSION, name, language)
+    now = time.monotonic()
+    entry = _discovery_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return dict(entry[1]) if entry[1] is not None else None
+
+    result = await _discover_library(name, language)
+
+    ttl = _DISCOVERY_TTL if result is not None else _DISCOVERY_NEGATIVE_TTL
+    _discovery_cache.pop(key, None)
+    if len(_discovery_cache) >= _DISCOVERY_CACHE_SIZE:
+        del _discovery_cache[next(iter(_discovery_cache))]
+    _discovery_cache[key] = (now + ttl, dict(result) if result is not None else None)
+    return result
+
+
+async def _discover_library(name: str, language: str | None = None) -> dict | None:
     """Discover library metadata from package registries.
 
     Queries all supported registries in parallel. Scores by:
@@ -1507,6 +1540,7 @@ async def discover_library(name: str, language: str | None = None) -> dict | Non
     return None
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_docs_url(url: str) -> str:
     """Normalize an overly-specific docs URL to a broader docs root.
 
@@ -1551,31 +1585,31 @@ async def try_llms_txt(base_url: str) -> str | None:
     parsed = urlparse(base_url)
     origin = f"{parsed.scheme}://{parsed.netloc}"
 
-    # Try both variants — prefer llms-full.txt (actual content)
-    for filename in ("llms-full.txt", "llms.txt"):
-        url = f"{origin}/{filename}"
-        try:
-            async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+    # Try both variants — prefer llms-full.txt (actual content). One client
+    # for both probes so the second reuses the first's connection.
+    async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+        for filename in ("llms-full.txt", "llms.txt"):
+            url = f"{origin}/{filename}"
+            try:
                 resp = await client.get(url)
-                if resp.status_code == 200:
-                    content = resp.text
-                    # Validate: should be substantial text, not an error page
-                    if len(content) > 200 and not content.strip().startswith(
-                        "<!DOCTYPE"
-                    ):
-                        # llms.txt (non-full) is often just a TOC with links.
-                        # Check quality: if >50% of non-empty lines are just
-                        # markdown links, skip — better to crawl actual pages.
-                        if filename == "llms.txt" and _is_toc_only(content):
-                            logger.info(
-                                f"Skipping {url}: TOC-only content, "
-                                "will fall back to crawling"
-                            )
-                            continue
-                        logger.info(f"Found {filename} at {url} ({len(content)} chars)")
-                        return content
-        except Exception:
-            continue
+            except Exception:
+                continue
+            if resp.status_code != 200:
+                continue
+            content = resp.text
+            # Validate: should be substantial text, not an error page
+            if len(content) <= 200 or content.strip().startswith("<!DOCTYPE"):
+                continue
+            # llms.txt (non-full) is often just a TOC with links.
+            # Check quality: if >50% of non-empty lines are just
+            # markdown links, skip — better to crawl actual pages.
+            if filename == "llms.txt" and _is_toc_only(content):
+                logger.info(
+                    f"Skipping {url}: TOC-only content, will fall back to crawling"
+                )
+                continue
+            logger.info(f"Found {filename} at {url} ({len(content)} chars)")
+            return content
 
     return None
 
@@ -1895,9 +1929,11 @@ def chunk_markdown(
     current_title = ""
     heading_path = ""
     current_lines: list[str] = []
+    # Length of "\n".join(current_lines), tracked instead of re-joined
+    current_size = -1
 
     def _flush():
-        nonlocal current_lines
+        nonlocal current_lines, current_size
         text = "\n".join(current_lines).strip()
         if len(text) >= min_chunk_size:
             # Split oversized chunks by double newline, preserving code blocks
@@ -1922,12 +1958,13 @@ def chunk_markdown(
                     }
                 )
         current_lines = []
+        current_size = -1
 
     h1 = ""
     h2 = ""
 
     for line in content.split("\n"):
-        heading_match = _HEADING_RE.match(line)
+        heading_match = _HEADING_RE.match(line) if line.startswith("#") else None
         if heading_match:
             level = len(heading_match.group(1))
             heading_text = heading_match.group(2).strip()
@@ -1944,12 +1981,13 @@ def chunk_markdown(
 
             elif level <= 4:
                 # Flush if current chunk is big enough
-                if len("\n".join(current_lines)) > max_chunk_size // 2:
+                if current_size > max_chunk_size // 2:
                     _flush()
                 current_title = heading_text
                 heading_path = " > ".join(filter(None, [h1, h2, heading_text]))
 
         current_lines.append(line)
+        current_size += len(line) + 1
 
     # Flush remaining
     _flush()
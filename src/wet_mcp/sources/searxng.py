@@ -13,6 +13,9 @@ _MAX_RETRIES = 3
 _BASE_DELAY = 1.0  # seconds
 _HEALTH_CHECK_TIMEOUT = 5.0
 
+# Built once: json.dumps() makes a new encoder per call with these options
+_RESULT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
 
 async def _check_health(searxng_url: str) -> bool:
     """Quick health check before issuing a search request.
@@ -45,8 +48,9 @@ async def _ensure_searxng_healthy(searxng_url: str) -> str:
 
     logger.warning(f"SearXNG at {searxng_url} is unhealthy, attempting restart...")
 
-    from wet_mcp.searxng_runner import ensure_searxng
+    from wet_mcp.searxng_runner import ensure_searxng, mark_searxng_unhealthy
 
+    mark_searxng_unhealthy()
     new_url = await ensure_searxng()
 
     if await _check_health(new_url):
@@ -65,6 +69,22 @@ async def search(
     categories: str = "general",
     max_results: int = 10,
 ) -> str:
+    """Search via SearXNG and return the results as a JSON string.
+
+    See ``search_results`` for retry and formatting behaviour.
+    """
+    data = await search_results(searxng_url, query, categories, max_results)
+    if "error" in data:
+        return json.dumps(data)
+    return _RESULT_ENCODER.encode(data)
+
+
+async def search_results(
+    searxng_url: str,
+    query: str,
+    categories: str = "general",
+    max_results: int = 10,
+) -> dict:
     """Search via SearXNG API with retry logic and health verification.
 
     Retries up to _MAX_RETRIES times with exponential backoff on
@@ -78,7 +98,7 @@ async def search(
         max_results: Maximum number of results
 
     Returns:
-        JSON string with search results
+        Dict with ``results``, ``total`` and ``query``, or ``error``
     """
     logger.info(f"Searching SearXNG: {query}")
 
@@ -154,7 +174,7 @@ async def search(
                 }
 
                 logger.info(f"Found {len(deduped)} results for: {query}")
-                return json.dumps(output, ensure_ascii=False, indent=2)
+                return output
 
             except httpx.HTTPStatusError as e:
                 status = e.response.status_code
@@ -166,7 +186,7 @@ async def search(
                 # Only retry on server errors (5xx), not client errors (4xx)
                 if status < 500:
                     logger.error(f"SearXNG client error (non-retryable): {last_error}")
-                    return json.dumps({"error": last_error})
+                    return {"error": last_error}
 
             except httpx.RequestError as e:
                 last_error = f"Request error: {e}"
@@ -195,4 +215,4 @@ async def search(
     # All retries exhausted
     error_msg = last_error or "All retry attempts failed"
     logger.error(f"SearXNG search failed after {_MAX_RETRIES} attempts: {error_msg}")
-    return json.dumps({"error": error_msg})
+    return {"error": error_msg}
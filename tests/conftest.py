@@ -1,6 +1,6 @@
 """Pytest configuration and fixtures."""
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -39,6 +39,36 @@ async def _reset_crawler_singleton():
     crawler_mod._browser_semaphore = None
 
 
+@pytest.fixture(autouse=True)
+def _reset_discovery_cache():
+    """Clear memoized docs discovery results so mocked registries apply."""
+    import wet_mcp.sources.docs as docs_mod
+
+    docs_mod._discovery_cache.clear()
+    yield
+    docs_mod._discovery_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_dns_cache(tmp_path):
+    """Keep DNS resolutions from leaking between tests or onto disk.
+
+    The shared (cross-process) DNS cache is pointed at a per-test directory
+    so mocked entries, including pickled lookup failures, never reach the
+    real data dir.
+    """
+    import diskcache
+
+    from wet_mcp.security import _DNS_CACHE
+
+    _DNS_CACHE.clear()
+    shared = diskcache.Cache(str(tmp_path / "dns_cache"))
+    with patch("wet_mcp.security._shared_dns", shared):
+        yield shared
+    shared.close()
+    _DNS_CACHE.clear()
+
+
 @pytest.fixture
 def mock_crawler_instance():
     """Create a mock AsyncWebCrawler instance for use with _get_crawler patch.
@@ -1,7 +1,8 @@
 """Tests for src/wet_mcp/cache.py — WebCache with TTL-based expiry.
 
 Covers cache hit/miss, TTL expiry, hit counting, purge mechanics,
-deterministic cache keys, get_extract cross-action lookup, and stats.
+deterministic cache keys, get_extract cross-action lookup, stats, and the
+in-process LRU layer.
 """
 
 import time
@@ -62,6 +63,11 @@ class TestCacheKey:
         k2 = _cache_key("search", {"query": "bar"})
         assert k1 != k2
 
+    def test_key_is_128_bit_hex(self):
+        key = _cache_key("search", {"query": "foo"})
+        assert len(key) == 32
+        int(key, 16)
+
 
 # -----------------------------------------------------------------------
 # Get / Set basics
@@ -144,6 +150,19 @@ class TestHitCounting:
         stats = cache.stats()
         assert stats["search"]["hits"] == 3
 
+    def test_sqlite_hits_persisted(self, tmp_path):
+        """Hits served from SQLite are written back on the next write."""
+        path = tmp_path / "shared.db"
+        writer = WebCache(path)
+        writer.set("search", {"query": "q"}, "result")
+        reader = WebCache(path)
+
+        assert reader.get("search", {"query": "q"}) == "result"
+        reader.set("search", {"query": "other"}, "x")
+        assert writer.stats()["search"]["hits"] == 1
+        writer.close()
+        reader.close()
+
     def test_miss_does_not_increment(self, cache):
         """Cache misses don't affect hit count."""
         cache.set("search", {"query": "a"}, "result")
@@ -153,6 +172,95 @@ class TestHitCounting:
         assert stats["search"]["hits"] == 0
 
 
+# -----------------------------------------------------------------------
+# In-process LRU
+# -----------------------------------------------------------------------
+
+
+class TestMemoryLayer:
+    def test_repeat_hit_served_from_memory(self, cache):
+        """A warm entry is returned without touching SQLite."""
+        cache.set("search", {"query": "q"}, "result")
+        cache._conn.execute("DELETE FROM web_cache")
+        cache._conn.commit()
+
+        assert cache.get("search", {"query": "q"}) == "result"
+
+    def test_memory_hit_returns_stored_object(self, cache):
+        """Warm hits hand back the stored string itself, not a copy."""
+        content = "x" * 10_000
+        cache.set("crawl", {"urls": ["u"]}, content)
+
+        assert cache.get("crawl", {"urls": ["u"]}) is content
+
+    def test_sqlite_hit_promoted(self, tmp_path):
+        """Entries written by another instance are promoted on first read."""
+        path = tmp_path / "shared.db"
+        writer = WebCache(path)
+        writer.set("search", {"query": "q"}, "result")
+        reader = WebCache(path)
+
+        assert reader.get("search", {"query": "q"}) == "result"
+        assert _cache_key("search", {"query": "q"}) in reader._mem
+        writer.close()
+        reader.close()
+
+    def test_memory_entry_expires(self, short_ttl_cache):
+        short_ttl_cache.set("search", {"query": "q"}, "result")
+        with patch("wet_mcp.cache.time.time", return_value=time.time() + 5):
+            assert short_ttl_cache.get("search", {"query": "q"}) is None
+
+    def test_lru_evicts_oldest(self, cache):
+        with patch("wet_mcp.cache._MEM_CACHE_SIZE", 2):
+            for i in range(3):
+                cache.set("search", {"query": str(i)}, f"r{i}")
+        assert _cache_key("search", {"query": "0"}) not in cache._mem
+        assert len(cache._mem) == 2
+
+    def test_lru_bounded_by_size(self, cache):
+        with patch("wet_mcp.cache._MEM_CACHE_MAX_CHARS", 25):
+            for i in range(3):
+                cache.set("search", {"query": str(i)}, "x" * 10)
+        assert _cache_key("search", {"query": "0"}) not in cache._mem
+        assert len(cache._mem) == 2
+        assert cache._mem_chars == 20
+
+    def test_oversized_entry_skips_memory(self, cache):
+        """Entries above the per-entry limit are served from SQLite only."""
+        with patch("wet_mcp.cache._MEM_ENTRY_MAX_CHARS", 5):
+            cache.set("crawl", {"urls": ["u"]}, "x" * 10)
+            assert _cache_key("crawl", {"urls": ["u"]}) not in cache._mem
+            assert cache.get("crawl", {"urls": ["u"]}) == "x" * 10
+        assert cache._mem_chars == 0
+
+    def test_clear_drops_memory(self, cache):
+        cache.set("search", {"query": "q"}, "result")
+        cache.set("extract", {"urls": ["u"]}, "page")
+        cache.clear("search")
+
+        assert cache.get("search", {"query": "q"}) is None
+        assert cache.get("extract", {"urls": ["u"]}) == "page"
+
+    async def test_async_roundtrip(self, tmp_path):
+        """aget/aset share storage with get/set across instances."""
+        path = tmp_path / "shared.db"
+        writer = WebCache(path)
+        await writer.aset("search", {"query": "q"}, "result")
+        reader = WebCache(path)
+
+        assert await reader.aget("search", {"query": "q"}) == "result"
+        assert await reader.aget("search", {"query": "other"}) is None
+        assert reader.get("search", {"query": "q"}) == "result"
+        writer.close()
+        reader.close()
+
+    async def test_async_memory_hit_stays_on_loop(self, cache):
+        cache.set("search", {"query": "q"}, "result")
+        with patch("wet_mcp.cache.asyncio.to_thread") as to_thread:
+            assert await cache.aget("search", {"query": "q"}) == "result"
+        to_thread.assert_not_called()
+
+
 # -----------------------------------------------------------------------
 # Purge mechanics
 # -----------------------------------------------------------------------
@@ -56,7 +56,7 @@ def reset_crawler_state():
 async def test_extract_success():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", new=MockAsyncWebCrawler),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.extract(
             ["https://safe.com"],
@@ -78,7 +78,7 @@ async def test_extract_success():
 async def test_extract_html_format():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", new=MockAsyncWebCrawler),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.extract(["https://safe.com"], format="html")
         data = json.loads(result_json)
@@ -87,7 +87,7 @@ async def test_extract_html_format():
 
 @pytest.mark.asyncio
 async def test_extract_unsafe_url():
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         with patch("wet_mcp.sources.crawler._get_crawler", new_callable=AsyncMock):
             result_json = await crawler.extract(["http://unsafe.com"])
         data = json.loads(result_json)
@@ -104,7 +104,7 @@ async def test_extract_crawler_failure():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.extract(["https://safe.com"])
         data = json.loads(result_json)
@@ -119,7 +119,7 @@ async def test_extract_crawler_exception():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.extract(["https://safe.com"])
         data = json.loads(result_json)
@@ -138,7 +138,7 @@ async def test_crawl_success():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.crawl(["https://safe.com"], depth=1, max_pages=3)
         data = json.loads(result_json)
@@ -152,7 +152,7 @@ async def test_crawl_success():
 
 @pytest.mark.asyncio
 async def test_crawl_unsafe_url():
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         with patch("wet_mcp.sources.crawler._get_crawler", new_callable=AsyncMock):
             result_json = await crawler.crawl(["http://unsafe.com"])
         data = json.loads(result_json)
@@ -167,7 +167,7 @@ async def test_crawl_exception():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.crawl(["https://safe.com"])
         data = json.loads(result_json)
@@ -186,7 +186,7 @@ async def test_sitemap_success():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.sitemap(["https://safe.com"], depth=1, max_pages=3)
         data = json.loads(result_json)
@@ -200,7 +200,7 @@ async def test_sitemap_success():
 
 @pytest.mark.asyncio
 async def test_sitemap_unsafe_url():
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         with patch("wet_mcp.sources.crawler._get_crawler", new_callable=AsyncMock):
             result_json = await crawler.sitemap(["http://unsafe.com"])
         data = json.loads(result_json)
@@ -215,7 +215,7 @@ async def test_sitemap_exception():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.sitemap(["https://safe.com"])
         data = json.loads(result_json)
@@ -236,7 +236,7 @@ async def test_list_media_success():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.list_media("https://safe.com", media_type="all")
         data = json.loads(result_json)
@@ -259,7 +259,7 @@ async def test_list_media_specific_type():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.list_media("https://safe.com", media_type="images")
         data = json.loads(result_json)
@@ -271,7 +271,7 @@ async def test_list_media_specific_type():
 
 @pytest.mark.asyncio
 async def test_list_media_unsafe_url():
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         result_json = await crawler.list_media("http://unsafe.com")
         data = json.loads(result_json)
         assert data["error"] == "Security Alert: Unsafe URL blocked"
@@ -287,7 +287,7 @@ async def test_list_media_failure():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.list_media("https://safe.com")
         data = json.loads(result_json)
@@ -317,7 +317,7 @@ async def test_download_media_success(tmp_path):
     mock_client.get.return_value = MockResponse(content=b"file data")
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
@@ -347,7 +347,7 @@ async def test_download_media_redirect(tmp_path):
     ]
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
@@ -368,7 +368,7 @@ async def test_download_media_redirect(tmp_path):
 
 @pytest.mark.asyncio
 async def test_download_media_unsafe_url(tmp_path):
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         result_json = await crawler.download_media(
             ["http://unsafe.com/image.jpg"], str(tmp_path)
         )
@@ -382,7 +382,7 @@ async def test_download_media_path_traversal(tmp_path):
     mock_client.get.return_value = MockResponse(content=b"file data")
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
@@ -407,7 +407,7 @@ async def test_download_media_http_error(tmp_path):
     mock_client.get.side_effect = Exception("HTTP Failed")
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
@@ -563,7 +563,7 @@ async def test_crawl_visited_and_depth():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.crawl(["https://safe.com"], depth=1, max_pages=5)
         json.loads(result_json)
@@ -582,7 +582,7 @@ async def test_sitemap_visited_and_depth():
     with (
         patch("wet_mcp.sources.crawler.AsyncWebCrawler", return_value=mock_crawler),
         patch("playwright.async_api.async_playwright"),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
     ):
         result_json = await crawler.sitemap(["https://safe.com"], depth=1, max_pages=5)
         json.loads(result_json)
@@ -594,7 +594,7 @@ async def test_download_media_redirect_no_location(tmp_path):
     mock_client.get.return_value = MockResponse(is_redirect=True, headers={})
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
@@ -617,7 +617,7 @@ async def test_download_media_too_many_redirects(tmp_path):
     )
 
     with (
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=True),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True),
         patch(
             "httpx.AsyncClient",
             return_value=AsyncMock(
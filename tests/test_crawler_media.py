@@ -110,7 +110,7 @@ async def test_list_media_max_items(mock_crawler_instance):
 @pytest.mark.asyncio
 async def test_list_media_unsafe_url():
     """Test unsafe URL handling."""
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=False):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False):
         result_json = await list_media(url="https://unsafe.com")
 
     results = json.loads(result_json)
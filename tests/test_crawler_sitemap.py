@@ -131,7 +131,7 @@ async def test_sitemap_unsafe_url(mock_crawler_instance):
             new_callable=AsyncMock,
             return_value=mock_crawler_instance,
         ),
-        patch("wet_mcp.sources.crawler.is_safe_url", return_value=False),
+        patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=False),
     ):
         result = await sitemap(["https://unsafe.example.com"], depth=1)
 
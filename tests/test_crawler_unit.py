@@ -130,7 +130,7 @@ async def test_crawl_unsafe_url(mock_crawler_instance):
             return_value=mock_crawler_instance,
         ),
         patch(
-            "wet_mcp.sources.crawler.is_safe_url", return_value=False
+            "wet_mcp.sources.crawler.is_safe_url_async", return_value=False
         ) as mock_is_safe,
     ):
         result_json = await crawl(urls=["https://unsafe.com"])
@@ -293,3 +293,29 @@ async def test_crawl_multiple_roots(mock_crawler_instance):
     results = json.loads(result_json)
     urls = [r["url"] for r in results]
     assert set(urls) == {"https://example.com", "https://other.com"}
+
+
+@pytest.mark.asyncio
+async def test_check_urls_dedupes():
+    """Batch SSRF check validates each distinct URL once."""
+    from wet_mcp.sources.crawler import _check_urls
+
+    async def fake_check(url: str) -> bool:
+        return "internal" not in url
+
+    with patch(
+        "wet_mcp.sources.crawler.is_safe_url_async", side_effect=fake_check
+    ) as mock_check:
+        verdicts = await _check_urls(
+            [
+                "https://example.com",
+                "http://internal.local",
+                "https://example.com",
+            ]
+        )
+
+    assert verdicts == {
+        "https://example.com": True,
+        "http://internal.local": False,
+    }
+    assert mock_check.call_count == 2
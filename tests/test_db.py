@@ -6,6 +6,7 @@ chunk quality scoring, and cross-chunk context retrieval.
 """
 
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -239,6 +240,16 @@ class TestSearch:
         assert len(results) > 0
         assert "Bonjour" in results[0]["content"]
 
+    def test_precomputed_fts_matches_search(self, db_with_data):
+        """``search`` with a ``search_fts`` result ranks like a plain search."""
+        db = db_with_data[0]
+        fts = db.search_fts(query="route decorator", library_name="fastapi")
+        assert fts is not None and fts["scores"]
+        assert db.search(
+            query="route decorator", library_name="fastapi", fts=fts
+        ) == db.search(query="route decorator", library_name="fastapi")
+        assert db.search_fts(query="anything", library_name="nonexistent") is None
+
     def test_search_result_format(self, db_with_data):
         """Each result has all expected fields."""
         db = db_with_data[0]
@@ -462,6 +473,41 @@ class TestChunksCRUD:
         assert results[0]["content"] == "just content"
 
 
+class TestEmbeddingCache:
+    def test_roundtrip_and_misses(self, db):
+        db.cache_embeddings([(b"a" * 16, [0.5, -1.0]), (b"b" * 16, [2.0, 0.25])])
+        found = db.get_cached_embeddings([b"a" * 16, b"b" * 16, b"c" * 16])
+        assert found == {b"a" * 16: [0.5, -1.0], b"b" * 16: [2.0, 0.25]}
+
+    def test_survives_chunk_clear(self, db):
+        lib_id = db.upsert_library(name="test")
+        ver_id = db.upsert_version(lib_id)
+        db.add_chunks(ver_id, lib_id, [{"content": "chunk"}])
+        db.cache_embeddings([(b"h" * 16, [1.0])])
+        db.clear_version_chunks(ver_id)
+        assert db.get_cached_embeddings([b"h" * 16]) == {b"h" * 16: [1.0]}
+
+    def test_oldest_rows_evicted_past_cap(self, db):
+        with patch("wet_mcp.db._EMBEDDING_CACHE_MAX_ROWS", 2):
+            for ts, key in enumerate((b"a", b"b", b"c")):
+                with patch("wet_mcp.db._now_ts", return_value=float(ts)):
+                    db.cache_embeddings([(key * 16, [1.0])])
+        found = db.get_cached_embeddings([b"a" * 16, b"b" * 16, b"c" * 16])
+        assert set(found) == {b"b" * 16, b"c" * 16}
+
+    def test_cleared_with_library_and_on_demand(self, db):
+        lib_id = db.upsert_library(name="test")
+        ver_id = db.upsert_version(lib_id)
+        db.add_chunks(ver_id, lib_id, [{"content": "chunk"}])
+        db.cache_embeddings([(b"h" * 16, [1.0])])
+        assert db.remove_library("test")
+        assert db.get_cached_embeddings([b"h" * 16]) == {}
+
+        db.cache_embeddings([(b"h" * 16, [1.0])])
+        assert db.clear_embedding_cache() == 1
+        assert db.get_cached_embeddings([b"h" * 16]) == {}
+
+
 # -----------------------------------------------------------------------
 # JSONL Export / Import
 # -----------------------------------------------------------------------
@@ -614,3 +660,122 @@ class TestEdgeCases:
         # Chunks should be gone
         results = db.search(query="cascade", library_name="cascade")
         assert results == []
+
+
+class TestQuantizedVectors:
+    """int8 vector storage with float32 rescoring (needs sqlite-vec)."""
+
+    @pytest.fixture
+    def vec_db(self, tmp_path):
+        db = DocsDB(tmp_path / "vec.db", embedding_dims=4)
+        if not db._vec_enabled:
+            db.close()
+            pytest.skip("sqlite-vec extension not loadable")
+        yield db
+        db.close()
+
+    def test_vectors_stored_as_int8(self, vec_db):
+        sql = vec_db._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'doc_chunks_vec'"
+        ).fetchone()["sql"]
+        assert "int8[4]" in sql
+        assert "+embedding_f32" in sql
+
+    def test_vector_search_rescores(self, vec_db):
+        lib_id = vec_db.upsert_library("veclib")
+        ver_id = vec_db.upsert_version(lib_id)
+        vec_db.add_chunks(
+            ver_id,
+            lib_id,
+            [{"content": "first"}, {"content": "second"}],
+            embeddings=[[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]],
+        )
+        results = vec_db.search(
+            "nomatch", library_name="veclib", query_embedding=[0.9, 0.1, 0.0, 0.0]
+        )
+        assert [r["content"] for r in results] == ["first", "second"]
+
+    def test_vector_search_scoped_to_library(self, vec_db):
+        """A small library is not crowded out by another library's vectors."""
+        big_lib = vec_db.upsert_library("biglib")
+        vec_db.add_chunks(
+            vec_db.upsert_version(big_lib),
+            big_lib,
+            [{"content": f"big {i}"} for i in range(40)],
+            embeddings=[[1.0, 0.0, 0.0, 0.0]] * 40,
+        )
+        small_lib = vec_db.upsert_library("smalllib")
+        vec_db.add_chunks(
+            vec_db.upsert_version(small_lib),
+            small_lib,
+            [{"content": "small one"}, {"content": "small two"}],
+            embeddings=[[0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]],
+        )
+
+        results = vec_db.search(
+            "nomatch",
+            library_name="smalllib",
+            limit=1,
+            query_embedding=[1.0, 0.0, 0.0, 0.0],
+        )
+        assert len(results) == 1
+        assert results[0]["content"].startswith("small")
+
+    def test_float_table_migrated(self, tmp_path):
+        import struct
+
+        db = DocsDB(tmp_path / "old.db", embedding_dims=4)
+        if not db._vec_enabled:
+            db.close()
+            pytest.skip("sqlite-vec extension not loadable")
+        db._conn.execute("DROP TABLE doc_chunks_vec")
+        db._conn.execute(
+            "CREATE VIRTUAL TABLE doc_chunks_vec "
+            "USING vec0(id TEXT PRIMARY KEY, embedding float[4])"
+        )
+        vec = struct.pack("4f", 1.0, 0.0, 0.0, 0.0)
+        db._conn.execute("INSERT INTO doc_chunks_vec VALUES ('a', ?)", (vec,))
+        db._conn.commit()
+        db.close()
+
+        db = DocsDB(tmp_path / "old.db", embedding_dims=4)
+        row = db._conn.execute(
+            "SELECT id, embedding_f32 FROM doc_chunks_vec"
+        ).fetchone()
+        assert row["id"] == "a"
+        assert row["embedding_f32"] == vec
+        db.close()
+
+    def test_unscoped_int8_table_migrated(self, vec_db, tmp_path):
+        """Tables without library/version columns are rebuilt with them."""
+        lib_id = vec_db.upsert_library("veclib")
+        ver_id = vec_db.upsert_version(lib_id)
+        vec_db.add_chunks(
+            ver_id, lib_id, [{"content": "first"}], embeddings=[[1.0, 0, 0, 0]]
+        )
+        rows = vec_db._conn.execute(
+            "SELECT id, embedding_f32 FROM doc_chunks_vec"
+        ).fetchall()
+        vec_db._conn.execute("DROP TABLE doc_chunks_vec")
+        vec_db._conn.execute(
+            "CREATE VIRTUAL TABLE doc_chunks_vec USING vec0("
+            "id TEXT PRIMARY KEY, embedding int8[4], +embedding_f32 BLOB)"
+        )
+        vec_db._conn.executemany(
+            "INSERT INTO doc_chunks_vec (id, embedding, embedding_f32) "
+            "VALUES (?, vec_quantize_int8(?, 'unit'), ?)",
+            [(r["id"], r["embedding_f32"], r["embedding_f32"]) for r in rows],
+        )
+        vec_db._conn.commit()
+        vec_db.close()
+
+        db = DocsDB(tmp_path / "vec.db", embedding_dims=4)
+        row = db._conn.execute(
+            "SELECT library_id, version_id FROM doc_chunks_vec"
+        ).fetchone()
+        assert (row["library_id"], row["version_id"]) == (lib_id, ver_id)
+        results = db.search(
+            "nomatch", library_name="veclib", query_embedding=[1.0, 0, 0, 0]
+        )
+        assert [r["content"] for r in results] == ["first"]
+        db.close()
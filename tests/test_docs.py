@@ -308,6 +308,23 @@ class TestDiscoverLibrary:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_discover_memoizes_results(self):
+        """Repeat lookups are served from the TTL cache, misses included."""
+        found = {"name": "react", "homepage": "https://react.dev"}
+        with patch(
+            "wet_mcp.sources.docs._discover_library",
+            new_callable=AsyncMock,
+            side_effect=[found, None],
+        ) as mock_discover:
+            first = await discover_library("react")
+            first["homepage"] = "mutated"
+            assert (await discover_library("react"))["homepage"] == "https://react.dev"
+            assert await discover_library("react", language="rust") is None
+            assert await discover_library("react", language="rust") is None
+
+        assert mock_discover.await_count == 2
+
 
 # -----------------------------------------------------------------------
 # try_llms_txt
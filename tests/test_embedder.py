@@ -357,6 +357,30 @@ class TestQwen3EmbedBackend:
 
         assert vec == pytest.approx([0.1, 0.2])
 
+    def test_threads_passed_to_session(self):
+        """ONNX session thread count is forwarded to TextEmbedding."""
+        with patch("qwen3_embed.TextEmbedding") as mock_te:
+            backend = init_backend("local", "local/m", threads=1)
+            backend._get_model()
+
+        mock_te.assert_called_once_with(model_name="local/m", threads=1)
+
+    def test_embed_queries_batches(self):
+        """embed_queries sends all queries to query_embed in one call."""
+        import numpy as np
+
+        backend = Qwen3EmbedBackend()
+        mock_model = MagicMock()
+        mock_model.query_embed.return_value = iter(
+            [np.array([0.1, 0.2]), np.array([0.3, 0.4])]
+        )
+
+        with patch.object(backend, "_get_model", return_value=mock_model):
+            vecs = backend.embed_queries(["a", "b"], dimensions=2)
+
+        mock_model.query_embed.assert_called_once_with(["a", "b"], dim=2)
+        assert vecs[1] == pytest.approx([0.3, 0.4])
+
     def test_check_available_success(self):
         """Returns dimensions when model loads successfully."""
         import numpy as np
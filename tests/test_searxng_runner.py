@@ -57,6 +57,13 @@ def test_get_settings_path():
         mock_settings_file.write_text.assert_called_once_with(expected_content)
 
 
+@pytest.fixture(autouse=True)
+def reset_verified_url():
+    """Keep the ensure_searxng fast path from leaking between tests."""
+    with patch("wet_mcp.searxng_runner._verified_url", None):
+        yield
+
+
 # Mock the settings object
 @pytest.fixture
 def mock_settings():
@@ -45,6 +45,7 @@ def reset_globals():
     module._last_restart_time = 0.0
     module._is_owner = False
     module._startup_lock = None
+    module._verified_url = None
     yield
     module._searxng_process = None
     module._searxng_port = None
@@ -52,6 +53,7 @@ def reset_globals():
     module._last_restart_time = 0.0
     module._is_owner = False
     module._startup_lock = None
+    module._verified_url = None
 
 
 def test_get_pip_command():
@@ -147,6 +149,7 @@ async def test_try_reuse_existing():
         patch("wet_mcp.searxng_runner._read_discovery") as mock_read,
         patch("wet_mcp.searxng_runner._is_pid_alive") as mock_alive,
         patch("wet_mcp.searxng_runner._quick_health_check") as mock_health,
+        patch("wet_mcp.searxng_runner._port_open", return_value=True),
     ):
         # Case 1: No discovery
         mock_read.return_value = None
@@ -632,3 +635,52 @@ def test_get_process_kwargs():
             subprocess.CREATE_NEW_PROCESS_GROUP = 512
         kwargs = _get_process_kwargs()
         assert "creationflags" in kwargs
+
+
+@pytest.mark.asyncio
+async def test_ensure_searxng_verified_fast_path():
+    import wet_mcp.searxng_runner as module
+
+    with (
+        patch("wet_mcp.searxng_runner.settings") as mock_settings,
+        patch(
+            "wet_mcp.searxng_runner._try_reuse_existing",
+            new_callable=AsyncMock,
+            return_value="http://127.0.0.1:9999",
+        ) as mock_reuse,
+    ):
+        mock_settings.wet_auto_searxng = True
+        assert await ensure_searxng() == "http://127.0.0.1:9999"
+        assert await ensure_searxng() == "http://127.0.0.1:9999"
+        mock_reuse.assert_awaited_once()
+
+        module.mark_searxng_unhealthy()
+        await ensure_searxng()
+        assert mock_reuse.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_port_open():
+    from wet_mcp.searxng_runner import _port_open
+
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        assert await _port_open(port) is True
+    assert await _port_open(port) is False
+
+
+@pytest.mark.asyncio
+async def test_port_open_ignores_reset_on_close():
+    from wet_mcp.searxng_runner import _port_open
+
+    writer = MagicMock()
+    writer.wait_closed = AsyncMock(side_effect=ConnectionResetError)
+    with patch(
+        "asyncio.open_connection",
+        new_callable=AsyncMock,
+        return_value=(MagicMock(), writer),
+    ):
+        assert await _port_open(1) is True
+    writer.close.assert_called_once()
+    writer.wait_closed.assert_awaited_once()
@@ -26,7 +26,7 @@ async def test_download_media_path_traversal(tmp_path):
     # But wait, is_safe_url checks scheme and IP.
     # "http://example.com/.." is safe network-wise (resolves to example.com IP).
 
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=True):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True):
         with patch(
             "wet_mcp.sources.crawler.httpx.AsyncClient", return_value=mock_client
         ):
@@ -54,7 +54,7 @@ async def test_download_media_safe(tmp_path):
     mock_client.__aenter__.return_value = mock_client
     mock_client.__aexit__.return_value = None
 
-    with patch("wet_mcp.sources.crawler.is_safe_url", return_value=True):
+    with patch("wet_mcp.sources.crawler.is_safe_url_async", return_value=True):
         with patch(
             "wet_mcp.sources.crawler.httpx.AsyncClient", return_value=mock_client
         ):
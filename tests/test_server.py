@@ -78,6 +78,24 @@ async def test_extract_with_options():
         )
 
 
+@pytest.mark.asyncio
+async def test_extract_dedupes_urls():
+    """Test duplicate URLs are dropped before extraction, keeping order."""
+    with patch("wet_mcp.server._extract", new_callable=AsyncMock) as mock_extract:
+        mock_extract.return_value = "Extracted Content"
+
+        await extract(
+            action="extract",
+            urls=["https://b.example", "https://a.example", "https://b.example"],
+        )
+
+        mock_extract.assert_called_once_with(
+            urls=["https://b.example", "https://a.example"],
+            format="markdown",
+            stealth=False,
+        )
+
+
 @pytest.mark.asyncio
 async def test_extract_missing_urls():
     """Test extract action missing urls."""
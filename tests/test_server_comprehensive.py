@@ -32,10 +32,40 @@ def mock_settings():
 def mock_web_cache():
     server._web_cache = MagicMock()
     server._web_cache.get.return_value = None
+    server._web_cache.aget = AsyncMock(return_value=None)
+    server._web_cache.aset = AsyncMock()
     yield server._web_cache
     server._web_cache = None
 
 
+@pytest.fixture(autouse=True)
+async def no_background_network():
+    """Keep docs background tasks off the network and cancel leftovers.
+
+    ``_do_docs_search`` launches indexing tasks that outlive the test;
+    without this they reach the real SearXNG installer after the test's
+    own patches have been undone.
+    """
+    with (
+        patch(
+            "wet_mcp.server.ensure_searxng",
+            new_callable=AsyncMock,
+            return_value="http://searxng.test",
+        ),
+        patch(
+            "wet_mcp.server.searxng_search_results",
+            new_callable=AsyncMock,
+            return_value={"results": []},
+        ),
+    ):
+        yield
+        current = asyncio.current_task()
+        leftover = [t for t in asyncio.all_tasks() if t is not current]
+        for task in leftover:
+            task.cancel()
+        await asyncio.gather(*leftover, return_exceptions=True)
+
+
 @pytest.fixture(autouse=True)
 def mock_docs_db():
     server._docs_db = MagicMock()
@@ -65,6 +95,50 @@ async def test_warmup_searxng_exception():
         await server._warmup_searxng()
 
 
+@pytest.mark.asyncio
+async def test_warmup_searxng_overlaps_crawl4ai_import():
+    import builtins
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "crawl4ai":
+            raise ImportError("no crawl4ai")
+        return real_import(name, *args, **kwargs)
+
+    with (
+        patch("wet_mcp.setup.run_auto_setup"),
+        patch("builtins.__import__", side_effect=fake_import),
+        patch(
+            "wet_mcp.searxng_runner.ensure_searxng", new_callable=AsyncMock
+        ) as mock_ensure,
+    ):
+        # A failed crawl4ai import must not stop SearXNG from starting.
+        await server._warmup_searxng()
+        mock_ensure.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_warm_local_models_only_touches_local_backends():
+    from wet_mcp.embedder import LiteLLMBackend, Qwen3EmbedBackend
+
+    local = MagicMock(spec=Qwen3EmbedBackend)
+    with (
+        patch("wet_mcp.embedder.get_backend", return_value=local),
+        patch("wet_mcp.reranker.get_reranker", return_value=None),
+    ):
+        await server._warm_local_models()
+    local.embed_single.assert_called_once()
+
+    cloud = MagicMock(spec=LiteLLMBackend)
+    with (
+        patch("wet_mcp.embedder.get_backend", return_value=cloud),
+        patch("wet_mcp.reranker.get_reranker", return_value=None),
+    ):
+        await server._warm_local_models()
+    cloud.embed_single.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_lifespan():
     mock_fastmcp = MagicMock()
@@ -77,10 +151,41 @@ async def test_lifespan():
         patch("wet_mcp.server.stop_searxng") as mock_stop,
     ):
         async with server._lifespan(mock_fastmcp):
-            pass
+            assert server._cpu_pool is not None
+            name = await server._to_thread(
+                lambda: __import__("threading").current_thread().name
+            )
+            assert name.startswith("wet-worker")
+            assert server._embed_pool is not None
+            assert server._embed_pool._max_workers == server._EMBED_POOL_WORKERS
 
         mock_shutdown.assert_awaited_once()
         mock_stop.assert_called_once()
+        assert server._cpu_pool is None
+        assert server._embed_pool is None
+
+
+@pytest.mark.asyncio
+async def test_to_embed_thread_routes_cloud_calls():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from wet_mcp.embedder import LiteLLMBackend
+
+    def thread_name():
+        return __import__("threading").current_thread().name
+
+    cloud = LiteLLMBackend.__new__(LiteLLMBackend)
+    with (
+        ThreadPoolExecutor(1, thread_name_prefix="wet-embed") as embed_pool,
+        ThreadPoolExecutor(1, thread_name_prefix="wet-worker") as cpu_pool,
+        patch("wet_mcp.server._embed_pool", embed_pool),
+        patch("wet_mcp.server._cpu_pool", cpu_pool),
+    ):
+        cloud_name = await server._to_embed_thread(cloud, thread_name)
+        local_name = await server._to_embed_thread(MagicMock(), thread_name)
+
+    assert cloud_name.startswith("wet-embed")
+    assert local_name.startswith("wet-worker")
 
 
 @pytest.mark.asyncio
@@ -94,6 +199,65 @@ async def test_init_embedding_backend():
         assert server._embedding_dims == 768
 
 
+@pytest.mark.asyncio
+async def test_init_embedding_backend_probes_candidates_concurrently(mock_settings):
+    import time
+
+    mock_settings.resolve_embedding_model.return_value = ""
+    delays = {server._EMBEDDING_CANDIDATES[0]: 0.3}
+
+    def make_backend(model):
+        backend = MagicMock()
+
+        def check():
+            time.sleep(delays.get(model, 0.1))
+            return 768
+
+        backend.check_available.side_effect = check
+        return backend
+
+    with (
+        patch("wet_mcp.embedder.LiteLLMBackend", side_effect=make_backend),
+        patch("wet_mcp.embedder.init_backend") as mock_init,
+    ):
+        start = time.monotonic()
+        await server._init_embedding_backend({"K": "V"})
+        elapsed = time.monotonic() - start
+
+    # Highest-priority candidate wins even though the others answered first.
+    mock_init.assert_called_once_with("litellm", server._EMBEDDING_CANDIDATES[0])
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_init_embedding_backend_uses_cached_probe(mock_web_cache):
+    mock_web_cache.get.return_value = "768"
+    with patch("wet_mcp.embedder.init_backend") as mock_init:
+        mock_backend = MagicMock()
+        mock_init.return_value = mock_backend
+
+        await server._init_embedding_backend({"K": "V"})
+
+        mock_backend.check_available.assert_not_called()
+        mock_web_cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_init_embedding_backend_caches_probe(mock_web_cache):
+    with patch("wet_mcp.embedder.init_backend") as mock_init:
+        mock_backend = MagicMock()
+        mock_backend.check_available.return_value = 768
+        mock_init.return_value = mock_backend
+
+        await server._init_embedding_backend({"K": "V"})
+
+        action, params, content = mock_web_cache.set.call_args[0]
+        assert action == "backend_probe"
+        assert params["model"] == "gemini"
+        assert "V" not in json.dumps(params)
+        assert content == "768"
+
+
 @pytest.mark.asyncio
 async def test_init_reranker_backend():
     with patch("wet_mcp.reranker.init_reranker") as mock_init:
@@ -108,13 +272,117 @@ async def test_init_reranker_backend():
 async def test_embed():
     with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
         mock_backend = MagicMock()
-        mock_backend.embed_single.return_value = [0.1, 0.2]
+        mock_backend.embed_texts.return_value = [[0.1, 0.2]]
         mock_get_backend.return_value = mock_backend
 
         res = await server._embed("hello")
         assert res == [0.1, 0.2]
 
 
+@pytest.mark.asyncio
+async def test_embed_coalesces_concurrent_calls():
+    with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts, dims: [
+            [float(len(t))] for t in texts
+        ]
+        mock_get_backend.return_value = mock_backend
+
+        res = await asyncio.gather(*(server._embed("x" * n) for n in (1, 2, 3)))
+
+        assert res == [[1.0], [2.0], [3.0]]
+        mock_backend.embed_texts.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_full_batch_flushes_without_timer():
+    with (
+        patch("wet_mcp.server._EMBED_MAX_LATENCY", 30),
+        patch("wet_mcp.embedder.get_backend") as mock_get_backend,
+    ):
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts, dims: [
+            [float(len(t))] for t in texts
+        ]
+        mock_get_backend.return_value = mock_backend
+
+        texts = [f"full batch {'x' * n}" for n in range(server._EMBED_MAX_BATCH)]
+        res = await asyncio.wait_for(
+            asyncio.gather(*(server._embed(t) for t in texts)), 1
+        )
+
+    assert res == [[float(len(t))] for t in texts]
+    mock_backend.embed_texts.assert_called_once()
+    assert not server._embed_pending
+
+
+def test_embed_batches_are_per_event_loop():
+    """A new loop (e.g. after a restart) never joins another loop's batch."""
+    with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts, dims: [[1.0]] * len(texts)
+        mock_get_backend.return_value = mock_backend
+
+        for text in ("first loop", "second loop"):
+            assert asyncio.run(server._embed(text)) == [1.0]
+    assert mock_backend.embed_texts.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_embed_memoizes_repeat_queries():
+    with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.return_value = [[0.3]]
+        mock_get_backend.return_value = mock_backend
+
+        assert await server._embed("same query") == [0.3]
+        assert await server._embed("same query") == [0.3]
+        mock_backend.embed_texts.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_failure_returns_none():
+    with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = RuntimeError("boom")
+        mock_get_backend.return_value = mock_backend
+
+        res = await asyncio.gather(server._embed("a"), server._embed("b"))
+        assert res == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_failed_backend_calls_drop_cached_probes(mock_web_cache):
+    backend = MagicMock()
+    backend.embed_texts.side_effect = RuntimeError("key revoked")
+    reranker = MagicMock()
+    reranker.rerank.side_effect = RuntimeError("model removed")
+    with (
+        patch("wet_mcp.server._backend_probes_dropped", False),
+        patch("wet_mcp.embedder.get_backend", return_value=backend),
+        patch("wet_mcp.reranker.get_reranker", return_value=reranker),
+    ):
+        assert await server._embed("probe me") is None
+        results = [{"content": "a"}, {"content": "b"}]
+        assert await server._rerank_results("q", results, 1) == results[:1]
+
+    # Cleared once, so the next start re-probes both backends
+    mock_web_cache.clear.assert_called_once_with("backend_probe")
+
+
+@pytest.mark.asyncio
+async def test_embed_short_backend_result_resolves_every_caller():
+    with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.return_value = [[0.1]]
+        mock_get_backend.return_value = mock_backend
+
+        res = await asyncio.wait_for(
+            asyncio.gather(server._embed("short a"), server._embed("short b")), 1
+        )
+        assert res == [None, None]
+
+
 @pytest.mark.asyncio
 async def test_embed_batch():
     with patch("wet_mcp.embedder.get_backend") as mock_get_backend:
@@ -126,6 +394,147 @@ async def test_embed_batch():
         assert res == [[0.1, 0.2]]
 
 
+@pytest.mark.asyncio
+async def test_embed_batch_splits_cloud_requests():
+    from wet_mcp.embedder import LiteLLMBackend
+
+    backend = LiteLLMBackend.__new__(LiteLLMBackend)
+
+    def fake_embed(texts, _dims):
+        if texts[0] == "t2":
+            raise RuntimeError("provider error")
+        return [[float(t[1:])] for t in texts]
+
+    with (
+        patch("wet_mcp.embedder.get_backend", return_value=backend),
+        patch.object(LiteLLMBackend, "MAX_BATCH_SIZE", 2),
+        patch.object(LiteLLMBackend, "embed_texts", side_effect=fake_embed) as spy,
+    ):
+        res = await server._embed_batch([f"t{i}" for i in range(5)])
+
+    assert spy.call_count == 3
+    assert res == [[0.0], [1.0], [], [], [4.0]]
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_cached_only_embeds_new_texts(tmp_path):
+    from wet_mcp.db import DocsDB
+
+    db = DocsDB(tmp_path / "docs.db")
+    with (
+        patch("wet_mcp.server._docs_db", db),
+        patch("wet_mcp.embedder.get_backend") as mock_get_backend,
+    ):
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts, _dims: [
+            [float(len(t))] for t in texts
+        ]
+        mock_get_backend.return_value = mock_backend
+
+        assert await server._embed_batch_cached(["a", "bb"]) == [[1.0], [2.0]]
+        assert await server._embed_batch_cached(["bb", "ccc", "a"]) == [
+            [2.0],
+            [3.0],
+            [1.0],
+        ]
+        assert mock_backend.embed_texts.call_args_list[1].args[0] == ["ccc"]
+        assert await server._embed_batch_cached(["dd", "a", "dd"]) == [
+            [2.0],
+            [1.0],
+            [2.0],
+        ]
+        assert mock_backend.embed_texts.call_args_list[2].args[0] == ["dd"]
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_background_index_stores_in_windows(tmp_path):
+    from wet_mcp.db import DocsDB
+
+    db = DocsDB(tmp_path / "docs.db")
+    lib_id = db.upsert_library(name="lib")
+    ver_id = db.upsert_version(lib_id)
+    chunks = [{"content": f"chunk {i}"} for i in range(300)]
+    # Same text on another page: stored too, with its own metadata
+    chunks.append({"content": "chunk 7", "url": "https://docs.lib/other"})
+    with (
+        patch("wet_mcp.server._INDEX_WINDOW", 128),
+        patch(
+            "wet_mcp.server._fetch_and_chunk_docs",
+            new_callable=AsyncMock,
+            return_value=(chunks, 5),
+        ),
+        patch.object(db, "add_chunks", wraps=db.add_chunks) as spy,
+    ):
+        await server._background_index_and_search(
+            "lib",
+            "lib",
+            None,
+            "https://docs.lib",
+            "",
+            "q",
+            None,
+            lib_id,
+            ver_id,
+            docs_db=db,
+            backend=None,
+            dims=0,
+        )
+
+    assert [len(c.kwargs["chunks"]) for c in spy.call_args_list] == [128, 128, 45]
+    assert db.get_best_version(lib_id)["chunk_count"] == 301
+    assert chunks[300]["chunk_index"] == 300
+    stored = [c for call in spy.call_args_list for c in call.kwargs["chunks"]]
+    assert stored[-1]["url"] == "https://docs.lib/other"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_background_index_keeps_snapshot_backend(tmp_path):
+    from wet_mcp.db import DocsDB
+
+    db = DocsDB(tmp_path / "docs.db")
+    lib_id = db.upsert_library(name="lib")
+    ver_id = db.upsert_version(lib_id)
+    chunks = [{"content": f"chunk {i}"} for i in range(4)]
+    snapshot = MagicMock()
+    snapshot.embed_texts.side_effect = lambda texts, _dims: [[1.0] for _ in texts]
+    swapped = MagicMock()
+    with (
+        patch("wet_mcp.server._docs_db", None),
+        patch("wet_mcp.server._INDEX_WINDOW", 2),
+        patch(
+            "wet_mcp.server._fetch_and_chunk_docs",
+            new_callable=AsyncMock,
+            return_value=(chunks, 1),
+        ),
+        # A config change mid-index must not leak into later windows
+        patch("wet_mcp.embedder.get_backend", return_value=swapped),
+        patch("wet_mcp.server._embedding_dims", 8),
+        patch.object(db, "add_chunks", wraps=db.add_chunks) as spy,
+    ):
+        await server._background_index_and_search(
+            "lib",
+            "lib",
+            None,
+            "https://docs.lib",
+            "",
+            "q",
+            None,
+            lib_id,
+            ver_id,
+            docs_db=db,
+            backend=snapshot,
+            dims=1,
+        )
+
+    swapped.embed_texts.assert_not_called()
+    assert all(c.args[1] == 1 for c in snapshot.embed_texts.call_args_list)
+    assert [len(c.kwargs["embeddings"]) for c in spy.call_args_list] == [2, 2]
+    assert db.get_best_version(lib_id)["chunk_count"] == 4
+    db.close()
+
+
 @pytest.mark.asyncio
 async def test_rerank_results():
     with patch("wet_mcp.reranker.get_reranker") as mock_get_reranker:
@@ -167,6 +576,25 @@ async def test_search_tool_docs():
         assert "docs_result" in res
 
 
+@pytest.mark.asyncio
+async def test_search_tool_docs_caches_indexed_results(mock_web_cache):
+    indexed = server._IndexedDocsResult(
+        server._RESULT_ENCODER.encode({"results": [], "source": "cached_index"})
+    )
+    pending = server._RESULT_ENCODER.encode({"status": "indexing_in_progress"})
+    with patch("wet_mcp.server._do_docs_search", new_callable=AsyncMock) as mock_docs:
+        mock_docs.return_value = pending
+        await server.search("docs", query="q", library="lib")
+        mock_web_cache.aset.assert_not_called()
+
+        mock_docs.return_value = indexed
+        await server.search("docs", query="q", library="lib")
+        action, params, content = mock_web_cache.aset.call_args[0]
+        assert action == "docs"
+        assert params["embedding"] == server._embedding_fingerprint()
+        assert content == indexed
+
+
 @pytest.mark.asyncio
 async def test_search_tool_invalid():
     res = await server.search("invalid")
@@ -222,6 +650,7 @@ async def test_media_tool():
 
 @pytest.mark.asyncio
 async def test_help_tool():
+    server._load_doc.cache_clear()
     with patch("wet_mcp.server.files") as mock_files:
         mock_path = MagicMock()
         mock_path.read_text.return_value = "help_text"
@@ -229,6 +658,24 @@ async def test_help_tool():
 
         res = await server.help("search")
         assert res == "help_text"
+    server._load_doc.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_help_tool_reads_each_doc_once():
+    server._load_doc.cache_clear()
+    with patch("wet_mcp.server.files") as mock_files:
+        mock_path = MagicMock()
+        mock_path.read_text.return_value = "help_text"
+        mock_files.return_value.joinpath.return_value = mock_path
+
+        await server.help("extract")
+        await server.help("extract")
+        assert mock_path.read_text.call_count == 1
+
+        mock_path.read_text.side_effect = FileNotFoundError
+        assert (await server.help("nope")).startswith("Error")
+    server._load_doc.cache_clear()
 
 
 @pytest.mark.asyncio
@@ -240,14 +687,52 @@ async def test_config_tool():
     assert "updated" in json.loads(res)["status"]
 
 
+@pytest.mark.asyncio
+async def test_config_set_dispatch():
+    res = json.loads(await server.config("set", "bogus", "1"))
+    assert res["valid_keys"] == sorted(server._CONFIG_SETTERS)
+
+    original = server.settings.sync_enabled
+    try:
+        res = json.loads(await server.config("set", "sync_enabled", "On"))
+        assert res["value"] is True
+        res = json.loads(await server.config("set", "sync_enabled", "no"))
+        assert res["value"] is False
+    finally:
+        server.settings.sync_enabled = original
+
+
+@pytest.mark.asyncio
+async def test_config_cache_clear_drops_embedding_cache(mock_web_cache):
+    res = json.loads(await server.config("cache_clear"))
+
+    assert res["status"] == "cache cleared"
+    mock_web_cache.clear.assert_called_once_with()
+    server._docs_db.clear_embedding_cache.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_config_docs_reindex_clears_docs_cache(mock_web_cache):
+    server._docs_db.get_library.return_value = {"id": "lib-1"}
+    server._docs_db.get_best_version.return_value = {"id": "ver-1"}
+
+    res = json.loads(await server.config("docs_reindex", "lib"))
+
+    assert res["status"] == "cleared"
+    server._docs_db.clear_version_chunks.assert_called_with("ver-1")
+    mock_web_cache.clear.assert_called_once_with("docs")
+
+
 @pytest.mark.asyncio
 async def test_do_research():
     with (
         patch("wet_mcp.server.ensure_searxng", new_callable=AsyncMock) as mock_ensure,
-        patch("wet_mcp.server.searxng_search", new_callable=AsyncMock) as mock_search,
+        patch(
+            "wet_mcp.server.searxng_search_results", new_callable=AsyncMock
+        ) as mock_search,
     ):
         mock_ensure.return_value = "url"
-        mock_search.return_value = json.dumps({"results": [{"url": "arxiv.org"}]})
+        mock_search.return_value = {"results": [{"url": "arxiv.org"}]}
         res = await server._do_research("test")
         assert "arxiv" in res
 
@@ -284,6 +769,10 @@ async def test_do_docs_search_cached():
 
         res = await server._do_docs_search("test", "test")
         assert "cached_index" in json.loads(res)["source"]
+        # FTS stage runs once and is reused alongside the query embedding
+        fts = server._docs_db.search_fts.return_value
+        assert server._docs_db.search.call_args.kwargs["fts"] is fts
+        assert server._docs_db.search.call_args.kwargs["query_embedding"] == [0.1]
 
 
 @pytest.mark.asyncio
@@ -318,6 +807,38 @@ async def test_do_docs_search_new():
         data = json.loads(res)
         assert data["status"] == "indexing_in_progress"
         assert data["library"] == "newlib"
+        # No index yet: the query is never embedded
+        mock_embed.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_do_docs_search_joins_running_indexer():
+    server._docs_db.upsert_version.return_value = "ver-1"
+    release = asyncio.Event()
+
+    async def slow_index(**_):
+        await release.wait()
+
+    with (
+        patch(
+            "wet_mcp.sources.docs.discover_library",
+            new_callable=AsyncMock,
+            return_value={"homepage": "http://docs"},
+        ),
+        patch(
+            "wet_mcp.server._background_index_and_search", side_effect=slow_index
+        ) as mock_index,
+        patch("wet_mcp.server._embed", new_callable=AsyncMock, return_value=None),
+    ):
+        await server._do_docs_search("newlib", "first")
+        await server._do_docs_search("newlib", "second")
+        assert mock_index.call_count == 1
+        assert "ver-1" in server._indexing_tasks
+
+        release.set()
+        await server._indexing_tasks["ver-1"]
+        await asyncio.sleep(0)
+        assert "ver-1" not in server._indexing_tasks
 
 
 @pytest.mark.asyncio
@@ -335,35 +856,39 @@ async def test_do_research_exception():
 
 
 @pytest.mark.asyncio
-async def test_do_research_json_decode_error():
+async def test_do_research_search_error():
     with (
         patch("wet_mcp.server.ensure_searxng", new_callable=AsyncMock) as mock_ensure,
-        patch("wet_mcp.server.searxng_search", new_callable=AsyncMock) as mock_search,
+        patch(
+            "wet_mcp.server.searxng_search_results", new_callable=AsyncMock
+        ) as mock_search,
     ):
         mock_ensure.return_value = "url"
-        mock_search.return_value = "invalid json"
+        mock_search.return_value = {"error": "HTTP error: 403"}
         res = await server._do_research("test")
-        assert res == "invalid json"
+        data = json.loads(res)
+        assert data["error"] == "HTTP error: 403"
+        assert data["search_type"] == "academic"
 
 
 @pytest.mark.asyncio
 async def test_do_research_source_types():
     with (
         patch("wet_mcp.server.ensure_searxng", new_callable=AsyncMock) as mock_ensure,
-        patch("wet_mcp.server.searxng_search", new_callable=AsyncMock) as mock_search,
+        patch(
+            "wet_mcp.server.searxng_search_results", new_callable=AsyncMock
+        ) as mock_search,
     ):
         mock_ensure.return_value = "url"
-        mock_search.return_value = json.dumps(
-            {
-                "results": [
-                    {"url": "scholar.google.com"},
-                    {"url": "semanticscholar.org"},
-                    {"url": "pubmed.ncbi.nlm.nih.gov"},
-                    {"url": "doi.org/10.123"},
-                    {"url": "other.org"},
-                ]
-            }
-        )
+        mock_search.return_value = {
+            "results": [
+                {"url": "scholar.google.com"},
+                {"url": "semanticscholar.org"},
+                {"url": "pubmed.ncbi.nlm.nih.gov"},
+                {"url": "doi.org/10.123"},
+                {"url": "other.org"},
+            ]
+        }
         res = await server._do_research("test")
         data = json.loads(res)
         types = [r["source_type"] for r in data["results"]]
@@ -382,8 +907,12 @@ async def test_fetch_and_chunk_docs_github_raw():
             "wet_mcp.sources.docs._try_github_raw_docs", new_callable=AsyncMock
         ) as mock_gh,
         patch("wet_mcp.sources.docs.chunk_markdown") as mock_chunk,
+        patch(
+            "wet_mcp.sources.docs.fetch_docs_pages", new_callable=AsyncMock
+        ) as mock_fetch,
     ):
         mock_llms.return_value = None
+        mock_fetch.return_value = []
         mock_gh.return_value = [{"content": "c", "title": "t", "url": "u"}]
         mock_chunk.return_value = [{"content": f"c{i}"} for i in range(30)]
         chunks, pages = await server._fetch_and_chunk_docs("docs_url", "repo_url")
@@ -391,6 +920,73 @@ async def test_fetch_and_chunk_docs_github_raw():
         assert len(chunks) == 30
         # Title injection check
         assert chunks[0]["title"] == "t"
+        # GitHub raw was enough: no browser crawl was started
+        mock_fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chunk_pages_keeps_page_order():
+    pages = [{"content": str(i), "url": f"u{i}", "title": f"t{i}"} for i in range(5)]
+    with patch(
+        "wet_mcp.sources.docs.chunk_markdown",
+        side_effect=lambda content, url: [{"content": content}, {"content": url}],
+    ):
+        chunks = await server._chunk_pages(pages)
+    assert [c["content"] for c in chunks[::2]] == ["0", "1", "2", "3", "4"]
+    assert all(c["title"] == f"t{i // 2}" for i, c in enumerate(chunks))
+
+
+def test_primary_docs_sufficient():
+    assert not server._primary_docs_sufficient("https://docs.example", [])
+    assert server._primary_docs_sufficient(
+        "https://cmake.org/cmake/help/latest/", [{"content": "x"}]
+    )
+    thin = [{"content": "x" * 300, "heading_path": "Intro"}] * 20
+    assert not server._primary_docs_sufficient("https://docs.example", thin)
+    structured = [
+        {"content": "x" * 300, "heading_path": f"Section {i}"} for i in range(20)
+    ]
+    assert server._primary_docs_sufficient("https://docs.example", structured)
+
+
+def test_chunk_embed_text():
+    chunk = {"title": "T", "heading_path": "T", "content": "x" * 5000}
+    assert server._chunk_embed_text(chunk) == "T | " + "x" * 1996
+    chunk = {"title": "", "heading_path": "H", "content": "body"}
+    assert server._chunk_embed_text(chunk) == "H | body"
+    assert server._chunk_embed_text({"content": "body"}) == "body"
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_chunk_docs_fast_github_beats_slow_llms():
+    llms_cancelled = asyncio.Event()
+
+    async def slow_llms(_url):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            llms_cancelled.set()
+            raise
+
+    with (
+        patch("wet_mcp.server._LLMS_HEAD_START", 0.01),
+        patch("wet_mcp.sources.docs.try_llms_txt", side_effect=slow_llms),
+        patch(
+            "wet_mcp.sources.docs._try_github_raw_docs", new_callable=AsyncMock
+        ) as mock_gh,
+        patch("wet_mcp.sources.docs.chunk_markdown") as mock_chunk,
+        patch(
+            "wet_mcp.sources.docs.fetch_docs_pages", new_callable=AsyncMock
+        ) as mock_fetch,
+    ):
+        mock_gh.return_value = [{"content": "c", "url": "u"}]
+        mock_chunk.return_value = [{"content": f"c{i}"} for i in range(30)]
+        mock_fetch.return_value = []
+        chunks, pages = await asyncio.wait_for(
+            server._fetch_and_chunk_docs("docs_url", "repo_url"), timeout=5
+        )
+        assert (len(chunks), pages) == (30, 1)
+        assert llms_cancelled.is_set()
 
 
 @pytest.mark.asyncio
@@ -416,6 +1012,7 @@ async def test_fetch_and_chunk_docs_crawl_fallback_to_gh():
         assert pages == 1
         assert len(chunks) == 1
         assert chunks[0]["content"] == "gh_chunk"
+        mock_fetch.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -485,14 +1082,16 @@ async def test_do_docs_search_fallback_searxng():
             "wet_mcp.sources.docs.discover_library", new_callable=AsyncMock
         ) as mock_discover,
         patch("wet_mcp.server.ensure_searxng", new_callable=AsyncMock) as mock_ensure,
-        patch("wet_mcp.server.searxng_search", new_callable=AsyncMock) as mock_search,
+        patch(
+            "wet_mcp.server.searxng_search_results", new_callable=AsyncMock
+        ) as mock_search,
         patch(
             "wet_mcp.server._fetch_and_chunk_docs", new_callable=AsyncMock
         ) as mock_fetch,
     ):
         mock_discover.return_value = None
         mock_ensure.return_value = "url"
-        mock_search.return_value = json.dumps({"results": [{"url": "http://docs.alt"}]})
+        mock_search.return_value = {"results": [{"url": "http://docs.alt"}]}
         # Mock fetch to return some chunks on first call
         mock_fetch.return_value = ([{"content": "chunk"}], 1)
 
@@ -509,12 +1108,14 @@ async def test_do_docs_search_fetch_timeout():
         ) as mock_discover,
         patch("wet_mcp.server._fetch_and_chunk_docs", side_effect=TimeoutError),
         patch("wet_mcp.server.ensure_searxng", new_callable=AsyncMock) as mock_ensure,
-        patch("wet_mcp.server.searxng_search", new_callable=AsyncMock) as mock_search,
+        patch(
+            "wet_mcp.server.searxng_search_results", new_callable=AsyncMock
+        ) as mock_search,
     ):
         mock_discover.return_value = {"homepage": "http://docs"}
         mock_ensure.return_value = "url"
         # The first fetch times out. It then falls back to searxng for alternatives.
-        mock_search.return_value = json.dumps({"results": []})
+        mock_search.return_value = {"results": []}
 
         res = await server._do_docs_search("test", "test")
         assert "indexing_in_progress" in res
@@ -551,6 +1152,22 @@ def test_prompts():
 
 
 def test_main():
-    with patch("wet_mcp.server.mcp.run") as mock_run:
+    with (
+        patch("wet_mcp.server.anyio.run") as mock_run,
+        patch.dict("sys.modules", {"uvloop": None}),
+    ):
         server.main()
-        mock_run.assert_called_once()
+    mock_run.assert_called_once_with(server.mcp.run_stdio_async, backend_options={})
+
+
+def test_main_runs_on_uvloop_when_available():
+    mock_uvloop = MagicMock()
+    with (
+        patch("wet_mcp.server.anyio.run") as mock_run,
+        patch.dict("sys.modules", {"uvloop": mock_uvloop}),
+    ):
+        server.main()
+    mock_uvloop.install.assert_not_called()
+    assert mock_run.call_args.kwargs["backend_options"] == {
+        "loop_factory": mock_uvloop.new_event_loop
+    }
@@ -168,3 +168,72 @@ def test_with_timeout_cleanup(mock_dependencies):
         assert cleanup_done[0] is True, "Cleanup block did not run"
 
     asyncio.run(_test())
+
+
+def test_with_timeout_outer_cancel_cancels_task(mock_dependencies):
+    """Test cancelling the caller also cancels the wrapped task."""
+    server_module, mock_settings = mock_dependencies
+    _with_timeout = server_module._with_timeout
+
+    mock_settings.tool_timeout = 10
+    inner_cancelled = [False]
+
+    async def long_coro():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            inner_cancelled[0] = True
+            raise
+
+    async def _test():
+        outer = asyncio.create_task(_with_timeout(long_coro(), "test_action"))
+        await asyncio.sleep(0.05)
+        outer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await outer
+        await asyncio.sleep(0)
+        assert inner_cancelled[0] is True
+
+    asyncio.run(_test())
+
+
+def test_with_timeout_task_timeout_error_propagates(mock_dependencies):
+    """Test a TimeoutError raised by the task is not reported as a tool timeout."""
+    server_module, mock_settings = mock_dependencies
+    _with_timeout = server_module._with_timeout
+
+    mock_settings.tool_timeout = 5
+
+    async def inner_timeout():
+        raise TimeoutError("upstream")
+
+    async def _test():
+        with pytest.raises(TimeoutError, match="upstream"):
+            await _with_timeout(inner_timeout(), "test_action")
+
+    asyncio.run(_test())
+
+
+def test_with_timeout_ignores_swallowed_cancellation(mock_dependencies):
+    """Test the deadline holds when the task suppresses CancelledError."""
+    server_module, mock_settings = mock_dependencies
+    _with_timeout = server_module._with_timeout
+
+    mock_settings.tool_timeout = 0.1
+
+    async def stubborn():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            pass  # swallowed once, as Crawl4AI may do
+        await asyncio.sleep(10)
+
+    async def _test():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with patch.object(server_module, "_CANCEL_GRACE_PERIOD", 0.1):
+            result = await _with_timeout(stubborn(), "test_action")
+        assert result.startswith("Error: 'test_action' timed out")
+        assert loop.time() - start < 1
+
+    asyncio.run(_test())
@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from wet_mcp.setup import (
+    _chromium_installed,
     _find_searx_package_dir,
     _get_pip_command,
     _install_searxng,
@@ -153,6 +154,22 @@ def test_patch_searxng_windows_no_pwd_import(mock_find_dir):
     mock_file.write_text.assert_not_called()
 
 
+@patch("sys.platform", "win32")
+@patch("wet_mcp.setup._find_searx_package_dir")
+def test_patch_searxng_windows_no_match_skips_write(mock_find_dir):
+    mock_dir = MagicMock(spec=Path)
+    mock_find_dir.return_value = mock_dir
+    mock_file = MagicMock(spec=Path)
+    mock_dir.__truediv__.return_value = mock_file
+    mock_file.exists.return_value = True
+
+    # Mentions pwd, but not in the shape the patch rewrites
+    mock_file.read_text.return_value = "import pwd  # user lookup\n"
+
+    patch_searxng_windows()
+    mock_file.write_text.assert_not_called()
+
+
 @patch("sys.platform", "win32")
 @patch("wet_mcp.setup._find_searx_package_dir")
 def test_patch_searxng_windows_no_dir(mock_find_dir):
@@ -235,10 +252,12 @@ def test_get_pip_command_sys_executable(mock_which):
 # Test _install_searxng
 
 
-@patch.dict("sys.modules", {"searx": MagicMock()})
-def test_install_searxng_already_installed():
-    # If import searx succeeds, should return True immediately
+@patch("wet_mcp.setup._find_searx_package_dir", return_value=Path("/site/searx"))
+@patch("subprocess.run")
+def test_install_searxng_already_installed(mock_run, mock_find):
+    # If the searx package is found, should return True immediately
     assert _install_searxng() is True
+    mock_run.assert_not_called()
 
 
 @patch.dict("sys.modules", {"searx": None})
@@ -298,13 +317,66 @@ def test_install_searxng_exception(mock_get_pip):
 # Test _setup_crawl4ai
 
 
+@patch("wet_mcp.setup._chromium_installed", return_value=False)
 @patch("subprocess.run")
-def test_setup_crawl4ai_success(mock_run):
+def test_setup_crawl4ai_success(mock_run, mock_installed):
     mock_run.return_value = MagicMock(returncode=0)
     assert _setup_crawl4ai() is True
     assert mock_run.call_count == 2
 
 
+@patch("wet_mcp.setup._chromium_installed", return_value=True)
+@patch("subprocess.run")
+def test_setup_crawl4ai_skips_installed_browser(mock_run, mock_installed):
+    mock_run.return_value = MagicMock(returncode=0)
+    assert _setup_crawl4ai() is True
+    assert mock_run.call_count == 1
+    assert "playwright" not in mock_run.call_args[0][0]
+
+
+def test_chromium_installed(tmp_path, monkeypatch):
+    package = tmp_path / "playwright"
+    (package / "driver" / "package").mkdir(parents=True)
+    (package / "driver" / "package" / "browsers.json").write_text(
+        '{"browsers": [{"name": "chromium", "revision": "7"},'
+        ' {"name": "chromium-headless-shell", "revision": "7"},'
+        ' {"name": "firefox", "revision": "9"}]}'
+    )
+    spec = MagicMock(submodule_search_locations=[str(package)])
+    browsers = tmp_path / "browsers"
+    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", str(browsers))
+
+    with patch("importlib.util.find_spec", return_value=spec):
+        assert _chromium_installed() is False
+        for name in ("chromium-7", "chromium_headless_shell-7"):
+            (browsers / name).mkdir(parents=True)
+            (browsers / name / "INSTALLATION_COMPLETE").touch()
+        assert _chromium_installed() is True
+
+        # A browser from another Playwright release does not count
+        (package / "driver" / "package" / "browsers.json").write_text(
+            '{"browsers": [{"name": "chromium", "revision": "8"}]}'
+        )
+        assert _chromium_installed() is False
+
+
+def test_setup_crawl4ai_overlaps_browser_download():
+    import threading
+
+    # The migration waits for the download to start: a sequential run
+    # would time out at the barrier instead of passing.
+    barrier = threading.Barrier(2, timeout=5)
+
+    with (
+        patch(
+            "wet_mcp.setup._install_playwright_chromium",
+            side_effect=lambda: barrier.wait(),
+        ),
+        patch("subprocess.run", side_effect=lambda *a, **k: barrier.wait()),
+    ):
+        assert _setup_crawl4ai() is True
+
+
 @patch("subprocess.run", side_effect=Exception("Test error"))
 def test_setup_crawl4ai_exception(mock_run):
     assert _setup_crawl4ai() is False
@@ -357,6 +429,29 @@ def test_run_auto_setup_crawl4ai_fail(
     mock_marker.touch.assert_not_called()
 
 
+@patch("wet_mcp.setup.needs_setup", return_value=True)
+@patch("wet_mcp.setup.SETUP_MARKER")
+@patch("pathlib.Path.mkdir")
+def test_run_auto_setup_pip_install_finishes_first(
+    mock_mkdir, mock_marker, mock_needs_setup
+):
+    # crawl4ai setup imports from site-packages: it must not overlap pip
+    order = []
+    with (
+        patch(
+            "wet_mcp.setup._install_searxng",
+            side_effect=lambda: order.append("searxng") or True,
+        ),
+        patch(
+            "wet_mcp.setup._setup_crawl4ai",
+            side_effect=lambda: order.append("crawl4ai") or True,
+        ),
+    ):
+        assert run_auto_setup() is True
+    assert order == ["searxng", "crawl4ai"]
+    mock_marker.touch.assert_called_once()
+
+
 # Test reset_setup
 
 
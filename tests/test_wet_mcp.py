@@ -14,3 +14,15 @@ def test_mcp_server_exists():
     """Test MCP server is initialized."""
     assert mcp is not None
     assert mcp.name == "wet"
+
+
+def test_package_import_does_not_load_server():
+    """CLI subcommands (warmup, setup-sync) start without the server."""
+    import subprocess
+    import sys
+
+    code = "import sys, wet_mcp; print('wet_mcp.server' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"